@@ -0,0 +1,45 @@
+"""
+Steps-per-second benchmark of BatchEnv with random actions.
+Usage:
+    python benchmarks/bench_batch_env.py [--envs 1 64 1024] [--steps N]
+"""
+from __future__ import annotations
+
+import argparse
+import time
+
+import numpy as np
+
+from just_another_rogue.batch_env import DIRECTIONS, BatchEnv
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--envs", type=int, nargs="+", default=[1, 64, 1024])
+    parser.add_argument("--steps", type=int, default=100)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print(f"{'envs':>6} {'reset s':>9} {'batch steps/s':>14} "
+          f"{'env steps/s':>12}")
+    for num_envs in args.envs:
+        env = BatchEnv(num_envs)
+
+        start = time.perf_counter()
+        observations = env.reset(seed=0)
+        reset_time = time.perf_counter() - start
+
+        actions = rng.integers(
+            len(DIRECTIONS), size=(args.steps, num_envs))
+        start = time.perf_counter()
+        for step_actions in actions:
+            assert env.step(step_actions) is observations
+        elapsed = time.perf_counter() - start
+
+        print(f"{num_envs:>6} {reset_time:>9.2f} "
+              f"{args.steps / elapsed:>14.1f} "
+              f"{args.steps * num_envs / elapsed:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
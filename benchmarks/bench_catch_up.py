@@ -0,0 +1,45 @@
+"""
+Time it takes to re-enter a level after being away for a number of turns.
+Usage:
+    python benchmarks/bench_catch_up.py [--away 10000] [--sizes 80x43 ...]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+
+from common import level as new_level, new_engine
+from just_another_rogue.game_map import GameMap
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--away", type=int, default=10_000)
+    parser.add_argument(
+        "--sizes", nargs="+", default=["80x43", "256x256", "1024x1024"])
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'monsters':>9} {'turns away':>11} {'enter ms':>9}")
+    for size in args.sizes:
+        width, height = (int(n) for n in size.split("x"))
+        random.seed(0)
+        engine = new_engine()
+        level = new_level(engine, width, height)
+        start_xy = (engine.player.x, engine.player.y)
+        engine.enter_level(level, *start_xy)
+
+        # Leave for an empty level, and let time go by there.
+        engine.enter_level(GameMap(engine, 3, 3), 1, 1)
+        engine.turn += args.away
+
+        start = time.perf_counter()
+        engine.enter_level(level, *start_xy)
+        elapsed = time.perf_counter() - start
+
+        print(f"{size:>10} {len(level.entities) - 1:>9} {args.away:>11} "
+              f"{elapsed * 1000:>9.2f}")
+
+
+if __name__ == "__main__":
+    main()
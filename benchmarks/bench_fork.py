@@ -0,0 +1,84 @@
+"""
+Benchmark of Engine.fork and Engine.snapshot/restore on a full-size level,
+compared with deep copying the whole engine.
+Usage:
+    python benchmarks/bench_fork.py [--width W] [--height H] [--forks N]
+"""
+from __future__ import annotations
+
+import argparse
+import copy
+import random
+import time
+import tracemalloc
+import typing as t
+
+from common import dungeon
+from just_another_rogue.actions import BumpAction
+from just_another_rogue.engine import Engine
+
+
+def play_turn(engine: Engine) -> None:
+    """
+    Play one turn of the game: move the player, then let the monsters act.
+    """
+    BumpAction(engine.player, dx=random.choice((-1, 1)), dy=0).perform()
+    engine.handle_enemy_turns()
+    engine.update_fov()
+
+
+def measure(
+    label: str, make: t.Callable[[], t.Any], count: int
+) -> None:
+    """
+    Print how many times per second make() runs, and how much memory each of
+        its results keeps alive.
+    """
+    start = time.perf_counter()
+    for _ in range(count):
+        make()
+    rate = count / (time.perf_counter() - start)
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    kept = [make() for _ in range(count)]
+    per_item = (tracemalloc.get_traced_memory()[0] - before) / count
+    tracemalloc.stop()
+    del kept
+
+    print(f"{label:<28} {rate:>12,.0f}/s {per_item / 1024:>10.1f} KiB")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=80)
+    parser.add_argument("--height", type=int, default=43)
+    parser.add_argument("--forks", type=int, default=1000)
+    args = parser.parse_args()
+
+    engine = dungeon(args.width, args.height)
+    print(f"{args.width}x{args.height} map, "
+          f"{len(engine.game_map.entities)} entities")
+    print(f"{'':<28} {'rate':>14} {'memory':>14}")
+
+    measure("deepcopy", lambda: copy.deepcopy(engine), args.forks // 10)
+    measure("fork", engine.fork, args.forks)
+
+    def fork_and_play() -> Engine:
+        fork = engine.fork()
+        play_turn(fork)
+        return fork
+
+    measure("fork + 1 turn", fork_and_play, args.forks)
+
+    snapshot = engine.snapshot()
+
+    def play_and_restore() -> None:
+        play_turn(engine)
+        engine.restore(snapshot)
+
+    measure("1 turn + restore", play_and_restore, args.forks)
+
+
+if __name__ == "__main__":
+    main()
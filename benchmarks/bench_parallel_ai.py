@@ -0,0 +1,68 @@
+"""
+Scaling benchmark for the monsters' turns, serial vs. parallel MonsterAI.
+Usage:
+    python benchmarks/bench_parallel_ai.py [--monsters N] [--max-workers N]
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import time
+import typing as t
+
+from common import dungeon, fill_with_monsters
+from just_another_rogue.engine import Engine
+
+
+def run(engine: Engine, workers: int, turns: int) -> t.Tuple[float, t.Any]:
+    """
+    Play some turns with the given number of workers.
+    Returns:
+        Tuple[float, Any]: Seconds per turn, and the final monster positions.
+    """
+    engine.close()
+    engine.ai.workers = workers
+    engine.handle_enemy_turns()  # Warm up the worker pool.
+
+    start = time.perf_counter()
+    for _ in range(turns):
+        engine.handle_enemy_turns()
+    elapsed = (time.perf_counter() - start) / turns
+
+    engine.close()
+    positions = sorted((e.x, e.y) for e in engine.game_map.entities)
+    return elapsed, positions
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--monsters", type=int, default=200_000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    results = {}
+    for workers in range(0, args.max_workers + 1):
+        engine = dungeon(
+            args.width,
+            args.height,
+            max_rooms=args.width * args.height // 100,
+            max_monster_per_room=0)
+        fill_with_monsters(engine, args.monsters)
+        results[workers] = run(engine, workers, args.turns)
+
+    serial_time, serial_positions = results[0]
+    print(f"{len(serial_positions) - 1} monsters, "
+          f"{args.width}x{args.height} map, {args.turns} turns")
+    print(f"{'workers':>8} {'ms/turn':>10} {'speedup':>8} {'same':>5}")
+    for workers, (elapsed, positions) in results.items():
+        print(
+            f"{workers:>8} {elapsed * 1000:>10.2f} "
+            f"{serial_time / elapsed:>8.2f} "
+            f"{str(positions == serial_positions):>5}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,307 @@
+"""
+Scaling benchmark suite. Times the main phases of the game while sweeping map
+size, room count and monster count, fits a power law t = c * n^k to each
+phase, and compares the results with a stored baseline.
+Usage:
+    python benchmarks/bench_scaling.py                    # compare
+    python benchmarks/bench_scaling.py --update-baseline  # store baseline
+    python benchmarks/bench_scaling.py --quick            # smaller sweeps
+The exit status is 1 when a phase got slower than the baseline by more than
+--threshold, or when its fitted exponent grew by more than --exponent-slack
+(e.g. a phase going from O(n) to O(n^2)), and 2 when there is no baseline to
+compare with.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import random
+import sys
+import time
+import typing as t
+
+import numpy as np
+import tcod
+
+from common import arena, dungeon, level, new_engine
+from just_another_rogue.procgen import RectangularRoom, place_entities
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+MAP_SIZES = [
+    (80, 50), (256, 256), (512, 512), (1024, 1024), (2048, 2048),
+    (4096, 4096),
+]
+ROOM_COUNTS = [25, 100, 400, 1600]
+MONSTER_COUNTS = [100, 1_000, 10_000, 100_000]
+
+
+class Timed(t.NamedTuple):
+    """
+    What a phase times: run, called once per timed call. If reset is given,
+        it is called, untimed, before each call of run, to bring the state
+        back to where it started.
+    """
+    run: t.Callable[[], t.Any]
+    reset: t.Optional[t.Callable[[], t.Any]] = None
+
+
+"""
+A phase builds its state for a given n and returns what to time.
+"""
+Setup = t.Callable[[int], Timed]
+
+
+def setup_generate(width: int, height: int, max_rooms: int) -> Timed:
+    engine = new_engine()
+
+    def run() -> None:
+        random.seed(0)
+        level(engine, width, height, max_rooms)
+
+    return Timed(run)
+
+
+def setup_generate_dungeon(n: int) -> Timed:
+    width, height = MAP_SIZES[n]
+    return setup_generate(width, height, max_rooms=30)
+
+
+def setup_generate_rooms(n: int) -> Timed:
+    return setup_generate(1024, 1024, max_rooms=n)
+
+
+def setup_place_entities(n: int) -> Timed:
+    engine = arena(n)
+    game_map = engine.game_map
+    entities = set(game_map.entities)
+    room = RectangularRoom(100, 100, 10, 10)
+
+    def reset() -> None:
+        # Start from the same population every time.
+        game_map.entities = set(entities)
+        random.seed(0)
+
+    return Timed(lambda: place_entities(room, game_map, 2), reset)
+
+
+def setup_get_blocking_entity(n: int) -> Timed:
+    game_map = arena(n).game_map
+    # The worst case: no entity there, so every entity is checked.
+    return Timed(lambda: game_map.get_blocking_entity_at_location(0, 0))
+
+
+def setup_update_fov(n: int) -> Timed:
+    width, height = MAP_SIZES[n]
+    engine = dungeon(width, height, max_rooms=30)
+    return Timed(engine.update_fov)
+
+
+def setup_handle_enemy_turns(n: int) -> Timed:
+    engine = arena(n)
+    # Without rolling back, the monsters would crowd around the player over
+    # the repeats, and later calls would time a different state.
+    snapshot = engine.snapshot()
+    return Timed(engine.handle_enemy_turns, lambda: engine.restore(snapshot))
+
+
+def setup_render(n: int) -> Timed:
+    width, height = MAP_SIZES[n]
+    engine = dungeon(width, height, max_rooms=30)
+    game_map = engine.game_map
+    console = tcod.Console(width, height, order="F")
+    return Timed(lambda: game_map.render(console))
+
+
+"""
+Every phase, with the axis it is swept over. For map sizes, setup receives an
+    index into MAP_SIZES, and n is the number of tiles.
+"""
+PHASES: t.Dict[str, t.Tuple[str, Setup]] = {
+    "generate_dungeon/map_size": ("map_size", setup_generate_dungeon),
+    "generate_dungeon/rooms": ("rooms", setup_generate_rooms),
+    "place_entities/monsters": ("monsters", setup_place_entities),
+    "get_blocking_entity_at_location/monsters": (
+        "monsters", setup_get_blocking_entity),
+    "update_fov/map_size": ("map_size", setup_update_fov),
+    "handle_enemy_turns/monsters": ("monsters", setup_handle_enemy_turns),
+    "render/map_size": ("map_size", setup_render),
+}
+
+
+def time_batch(timed: Timed, number: int) -> float:
+    """
+    Returns:
+        float: The mean seconds per call over number calls of timed.run.
+            Without a reset, the calls are timed together; otherwise each
+            one is timed on its own, after its reset.
+    """
+    if timed.reset is None:
+        start = time.perf_counter()
+        for _ in range(number):
+            timed.run()
+        return (time.perf_counter() - start) / number
+
+    total = 0.0
+    for _ in range(number):
+        timed.reset()
+        start = time.perf_counter()
+        timed.run()
+        total += time.perf_counter() - start
+    return total / number
+
+
+def time_call(timed: Timed, repeat: int = 3) -> float:
+    """
+    Returns:
+        float: The best, over some runs, of the mean seconds per call. Each
+            run calls timed.run as many times as fit in about 0.1 seconds.
+    """
+    elapsed = time_batch(timed, 1)
+    number = max(1, int(0.1 / max(elapsed, 1e-9)))
+    return min(time_batch(timed, number) for _ in range(repeat))
+
+
+def fit_exponent(points: t.List[t.Tuple[int, float]]) -> float:
+    """
+    Fit t - t0 = c * (n - n0)^k, where (n0, t0) is the smallest n measured.
+        Subtracting t0 takes the fixed cost of a call out of the fit, which
+        would otherwise flatten it (e.g. a linear scan measured on small
+        inputs would look like O(n^0.5)).
+    Returns:
+        float: k in the least squares fit of log(t - t0) = log(c) +
+            k * log(n - n0). Points no slower than t0 are left out, and 0 is
+            returned if fewer than two are left.
+    """
+    (n0, t0), *rest = sorted(points)
+    grown = [(n - n0, seconds - t0) for n, seconds in rest if seconds > t0]
+    if len(grown) < 2:
+        return 0.0
+    n, seconds = np.log(np.array(grown, dtype=float)).T
+    return float(np.polyfit(n, seconds, 1)[0])
+
+
+def complexity_class(exponent: float) -> str:
+    """
+    Returns:
+        str: The closest of O(1), O(n^0.5), O(n), O(n^1.5), O(n^2)...
+    """
+    halves = max(0, round(exponent * 2))
+    if halves == 0:
+        return "O(1)"
+    if halves == 2:
+        return "O(n)"
+    if halves % 2 == 0:
+        return f"O(n^{halves // 2})"
+    return f"O(n^{halves / 2})"
+
+
+def run_phase(
+    name: str, axis: str, setup: Setup, quick: bool
+) -> t.Dict[str, t.Any]:
+    """
+    Time one phase over its axis and fit its scaling curve.
+    """
+    if axis == "map_size":
+        sizes = MAP_SIZES[:4] if quick else MAP_SIZES
+        inputs = list(range(len(sizes)))
+        ns = [w * h for w, h in sizes]
+    else:
+        counts = ROOM_COUNTS if axis == "rooms" else MONSTER_COUNTS
+        ns = counts[:3] if quick else counts
+        inputs = ns
+
+    points = []
+    for n, arg in zip(ns, inputs):
+        points.append((n, time_call(setup(arg))))
+        print(f"  {name:<42} n={n:<10} {points[-1][1] * 1000:>10.3f} ms",
+              flush=True)
+
+    exponent = fit_exponent(points)
+    return {"axis": axis, "points": points, "exponent": exponent}
+
+
+def compare(
+    results: t.Dict[str, t.Any],
+    baseline: t.Dict[str, t.Any],
+    threshold: float,
+    exponent_slack: float,
+) -> t.List[str]:
+    """
+    Returns:
+        List[str]: A description of every regression found. A phase regresses
+            when its times, over the sizes both runs measured, are slower
+            than the baseline by more than threshold (geometric mean of the
+            ratios), or when its exponent grew by more than exponent_slack.
+    """
+    failures = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        old_points = dict((n, s) for n, s in baseline[name]["points"])
+        ratios = [s / old_points[n] for n, s in result["points"]
+                  if n in old_points]
+        if ratios:
+            ratio = math.exp(sum(map(math.log, ratios)) / len(ratios))
+            if ratio > 1 + threshold:
+                failures.append(
+                    f"{name}: {ratio:.2f}x slower than the baseline")
+
+        old_k, new_k = baseline[name]["exponent"], result["exponent"]
+        if new_k > old_k + exponent_slack:
+            failures.append(
+                f"{name}: scaling went from {complexity_class(old_k)} "
+                f"(k={old_k:.2f}) to {complexity_class(new_k)} "
+                f"(k={new_k:.2f})")
+    return failures
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__,
+        formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument("--quick", action="store_true")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--exponent-slack", type=float, default=0.3)
+    parser.add_argument(
+        "--phases", nargs="+", choices=sorted(PHASES), default=list(PHASES))
+    args = parser.parse_args()
+
+    results = {}
+    for name in args.phases:
+        axis, setup = PHASES[name]
+        results[name] = run_phase(name, axis, setup, args.quick)
+
+    print()
+    for name, result in results.items():
+        print(f"{name:<42} k={result['exponent']:>5.2f} "
+              f"{complexity_class(result['exponent'])}")
+
+    if args.update_baseline:
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}, nothing to compare with. "
+              f"Store one first with --update-baseline.")
+        return 2
+
+    with open(args.baseline, encoding="utf-8") as f:
+        baseline = json.load(f)
+    failures = compare(results, baseline, args.threshold, args.exponent_slack)
+    print()
+    for failure in failures:
+        print(f"REGRESSION {failure}")
+    if not failures:
+        print("No regressions.")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,71 @@
+"""
+Build time, memory use and lookup speed of the visibility atlas at several
+map sizes, compared with computing the field of view every turn.
+Usage:
+    python benchmarks/bench_visibility_atlas.py [--sizes 80x43 256x256 ...]
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import typing as t
+
+import numpy as np
+
+from common import dungeon
+from just_another_rogue.engine import Engine
+
+
+def time_update_fov(
+    engine: Engine, origins: t.List[t.Tuple[int, int]]
+) -> float:
+    """
+    Returns:
+        float: Mean seconds per update_fov call, with the player standing on
+            each of the given tiles in turn.
+    """
+    start = time.perf_counter()
+    for x, y in origins:
+        engine.player.x, engine.player.y = x, y
+        engine.update_fov()
+    return (time.perf_counter() - start) / len(origins)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--sizes",
+        nargs="+",
+        default=["80x43", "256x256", "512x512", "1024x1024"])
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    print(f"{'size':>10} {'origins':>9} {'build s':>8} {'MiB':>8} "
+          f"{'B/origin':>9} {'fov us':>9} {'atlas us':>9}")
+    for size in args.sizes:
+        width, height = (int(n) for n in size.split("x"))
+        engine = dungeon(width, height, max_monster_per_room=0)
+        game_map = engine.game_map
+
+        start = time.perf_counter()
+        atlas = game_map.build_visibility_atlas(engine.fov_radius)
+        build_time = time.perf_counter() - start
+
+        walkable = np.argwhere(atlas.index >= 0).tolist()
+        origins = [
+            (x, y) for x, y in
+            random.sample(walkable, min(args.lookups, len(walkable)))
+        ]
+        with_atlas = time_update_fov(engine, origins)
+        game_map.visibility_atlas = None
+        without_atlas = time_update_fov(engine, origins)
+
+        print(f"{size:>10} {len(atlas.masks):>9} {build_time:>8.2f} "
+              f"{atlas.nbytes / 2**20:>8.2f} "
+              f"{atlas.nbytes / len(atlas.masks):>9.1f} "
+              f"{without_atlas * 1e6:>9.1f} {with_atlas * 1e6:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
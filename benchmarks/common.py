@@ -0,0 +1,97 @@
+"""
+Setup shared by the benchmarks: the engines and levels they time.
+"""
+from __future__ import annotations
+
+import copy
+import random
+import typing as t
+
+import numpy as np
+
+from just_another_rogue import entity_factories
+from just_another_rogue import tile_types
+from just_another_rogue.engine import Engine
+from just_another_rogue.game_map import GameMap
+from just_another_rogue.procgen import generate_dungeon
+
+
+def new_engine() -> Engine:
+    """
+    Create an engine with a fresh player, and no level yet.
+    """
+    return Engine(copy.deepcopy(entity_factories.player))
+
+
+def level(
+    engine: Engine,
+    width: int,
+    height: int,
+    max_rooms: t.Optional[int] = None,
+    max_monster_per_room: int = 2,
+) -> GameMap:
+    """
+    Generate a level for engine. By default it has the room density and
+        monsters main() uses, whatever its size.
+    """
+    if max_rooms is None:
+        max_rooms = 30 * (width * height) // (80 * 43)
+    return generate_dungeon(
+        max_rooms=max_rooms,
+        room_min_size=6,
+        room_max_size=10,
+        map_width=width,
+        map_heigth=height,
+        max_monster_per_room=max_monster_per_room,
+        engine=engine)
+
+
+def dungeon(
+    width: int,
+    height: int,
+    seed: int = 0,
+    max_rooms: t.Optional[int] = None,
+    max_monster_per_room: int = 2,
+) -> Engine:
+    """
+    Create an engine whose player stands on a new level (see level).
+    """
+    random.seed(seed)
+    engine = new_engine()
+    engine.game_map = level(
+        engine, width, height, max_rooms, max_monster_per_room)
+    engine.update_fov()
+    return engine
+
+
+def fill_with_monsters(engine: Engine, monsters: int, seed: int = 0) -> None:
+    """
+    Spawn orcs on random free floor tiles of the engine's level, then mark
+        the whole level as visible, so every monster takes a real turn.
+    """
+    game_map = engine.game_map
+    floor = np.argwhere(game_map.tiles["walkable"])
+    rng = np.random.default_rng(seed)
+    player_xy = (engine.player.x, engine.player.y)
+    spawned = 0
+    for x, y in rng.permutation(floor).tolist():
+        if spawned == monsters:
+            break
+        if (x, y) != player_xy:
+            entity_factories.orc.spaws(game_map, x, y)
+            spawned += 1
+    game_map.visible[:] = True
+
+
+def arena(monsters: int, size: int = 512, seed: int = 0) -> Engine:
+    """
+    Build a single open room filled with monsters (see fill_with_monsters),
+        with the player in the middle.
+    """
+    engine = new_engine()
+    game_map = GameMap(engine, size, size, entities=[engine.player])
+    game_map.tiles[1:-1, 1:-1] = tile_types.floor
+    engine.game_map = game_map
+    engine.player.place(size // 2, size // 2, game_map)
+    fill_with_monsters(engine, monsters, seed)
+    return engine
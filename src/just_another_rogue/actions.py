@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import numpy as np
 import typing as t
 
+from just_another_rogue import color
+from just_another_rogue.exploration import find_path
+
 if t.TYPE_CHECKING:
     from just_another_rogue.engine import Engine
     from just_another_rogue.entity import Entity
@@ -34,6 +38,15 @@ class Action:
         """
         raise NotImplementedError()
 
+    def repeat(self) -> bool:
+        """
+        Called after the turn this action was performed in has ended.
+        Returns:
+            bool: True if this action should be performed again right away,
+                without rendering the turn in between. Defaults to False.
+        """
+        return False
+
 
 class EscapeAction(Action):
     """
@@ -94,7 +107,9 @@ class MeleeAction(ActionWithDirection):
         if not target:
             return
 
-        print(f"You kick the {target.name}, much to its annoyance!")
+        self.engine.message_log.add_message(
+            f"You kick the {target.name}, much to its annoyance!",
+            color.player_atk)
 
 
 class MovementAction(ActionWithDirection):
@@ -138,3 +153,136 @@ class BumpAction(ActionWithDirection):
             return MeleeAction(self.entity, self.dx, self.dy).perform()
         else:
             return MovementAction(self.entity, self.dx, self.dy).perform()
+
+
+class TravelAction(Action):
+    """
+    TravelAction walks the entity towards a destination, one step per turn,
+        for as many turns as needed. The turns in between are not rendered.
+        Travelling stops when the destination is reached, when a step fails,
+        as soon as a new entity comes into view, when a visible entity is
+        close by, or when the player was attacked. It does not even start
+        with an entity close by.
+    Properties:
+        entity (Entity): The object performing the action.
+        dest_x (int): The x coordinate of the destination.
+        dest_y (int): The y coordinate of the destination.
+        max_steps (int): Maximum number of steps to take in one go.
+        danger_distance (int): Visible entities this close (in tiles, counting
+            diagonal steps as one) stop travelling.
+    """
+    max_steps = 1000
+    danger_distance = 3
+
+    def __init__(self, entity: Entity, dest_x: int, dest_y: int) -> None:
+        super().__init__(entity)
+        self.dest_x = dest_x
+        self.dest_y = dest_y
+        self.steps = 0
+        self.moved = False
+        self.path: t.Optional[t.List[t.Tuple[int, int]]] = None
+        self.seen: t.Optional[t.Set[Entity]] = None
+
+    def visible_entities(self) -> t.Set[Entity]:
+        """
+        Returns:
+            Set[Entity]: The entities, other than this one, currently visible.
+        """
+        game_map = self.engine.game_map
+        return {
+            entity for entity in game_map.entities
+            if entity is not self.entity
+            and game_map.visible[entity.x, entity.y]
+        }
+
+    def nearby_entity(self) -> t.Optional[Entity]:
+        """
+        Returns:
+            Optional[Entity]: A visible entity within danger_distance, if any.
+        """
+        for entity in self.visible_entities():
+            if max(
+                abs(entity.x - self.entity.x), abs(entity.y - self.entity.y)
+            ) <= self.danger_distance:
+                return entity
+        return None
+
+    def next_step(self) -> t.Optional[t.Tuple[int, int]]:
+        """
+        Returns:
+            Optional[Tuple[int, int]]: The next position to move to, or None if
+                there is nowhere left to go.
+        """
+        if self.path is None:
+            game_map = self.engine.game_map
+            goal = np.full(
+                (game_map.width, game_map.height), fill_value=False, order="F")
+            if game_map.in_bounds(self.dest_x, self.dest_y):
+                goal[self.dest_x, self.dest_y] = True
+            start = (self.entity.x, self.entity.y)
+            self.path = find_path(game_map, start, goal)
+            if not self.path and start != (self.dest_x, self.dest_y):
+                self.engine.message_log.add_message(
+                    "You don't know how to get there.")
+        return self.path.pop(0) if self.path else None
+
+    def perform(self) -> None:
+        """
+        Take one step towards the destination.
+        """
+        self.moved = False
+        if self.seen is None:
+            self.seen = self.visible_entities()
+            nearby = self.nearby_entity()
+            if nearby:
+                self.engine.message_log.add_message(
+                    f"You can't travel with the {nearby.name} nearby.")
+                return
+
+        step = self.next_step()
+        if step is None:
+            return
+
+        x, y = self.entity.x, self.entity.y
+        MovementAction(self.entity, step[0] - x, step[1] - y).perform()
+        self.moved = (self.entity.x, self.entity.y) != (x, y)
+        self.steps += 1
+
+    def repeat(self) -> bool:
+        if not self.moved or self.steps >= self.max_steps:
+            return False
+        if self.engine.player_attacked:
+            return False
+
+        visible = self.visible_entities()
+        new = visible - (self.seen or set())
+        self.seen = visible
+        if new:
+            for entity in new:
+                self.engine.message_log.add_message(
+                    f"You see the {entity.name}.")
+            return False
+
+        nearby = self.nearby_entity()
+        if nearby:
+            self.engine.message_log.add_message(
+                f"You stop, the {nearby.name} is nearby.")
+            return False
+        return True
+
+
+class AutoExploreAction(TravelAction):
+    """
+    AutoExploreAction walks the entity towards the nearest unexplored part of
+        the map, for as many turns as needed, like TravelAction.
+    """
+    def __init__(self, entity: Entity) -> None:
+        super().__init__(entity, entity.x, entity.y)
+
+    def next_step(self) -> t.Optional[t.Tuple[int, int]]:
+        step = self.engine.game_map.explorer.next_step(
+            self.entity.x, self.entity.y)
+        if step is None and self.steps == 0:
+            self.engine.message_log.add_message(
+                "There is nothing left to explore.")
+        return step
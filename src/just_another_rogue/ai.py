@@ -0,0 +1,335 @@
+from __future__ import annotations
+
+import multiprocessing
+import multiprocessing.pool
+import numpy as np
+import typing as t
+from multiprocessing import resource_tracker, shared_memory
+
+from just_another_rogue import color
+
+if t.TYPE_CHECKING:
+    from just_another_rogue.engine import Engine
+    from just_another_rogue.entity import Entity
+    from just_another_rogue.game_map import GameMap
+
+"""
+Describes an array published in shared memory: the name of the array, the
+    name of its shared memory block, its shape and its dtype string.
+"""
+ArrayDescriptor = t.Tuple[str, str, t.Tuple[int, ...], str]
+
+"""
+Shared memory blocks attached by a worker process, by array name. Attaching
+    is done once per block, not once per task, and a block is let go once the
+    array moves to a new block.
+"""
+_attached: t.Dict[str, shared_memory.SharedMemory] = {}
+
+
+def propose_moves(
+    walkable: np.ndarray,
+    visible: np.ndarray,
+    occupied: np.ndarray,
+    positions: np.ndarray,
+    player_xy: t.Tuple[int, int],
+    start: int,
+    stop: int,
+) -> np.ndarray:
+    """
+    Compute where each actor in positions[start:stop] wants to go. An actor
+        only acts if it stands on a visible tile (if the player can see it,
+        it can see the player). In that case it steps towards the player,
+        trying the diagonal first and then each axis alone, skipping tiles
+        that are not walkable or that are occupied at the start of the turn.
+        Stepping into the player means attacking it.
+    Parameters:
+        walkable (np.ndarray): The walkable layer of the map's tiles.
+        visible (np.ndarray): The tiles the player can currently see.
+        occupied (np.ndarray): The tiles actors stand on.
+        positions (np.ndarray): (n, 2) array with the position of every actor.
+        player_xy (Tuple[int, int]): The position of the player.
+        start (int): Index of the first actor to evaluate.
+        stop (int): Index after the last actor to evaluate.
+    Returns:
+        np.ndarray: (stop - start, 2) array with the proposed destination of
+            each actor. Actors that stay put propose their own position.
+    """
+    px, py = player_xy
+    pos = positions[start:stop]
+    x = pos[:, 0]
+    y = pos[:, 1]
+    dx = np.sign(px - x)
+    dy = np.sign(py - y)
+
+    dest = pos.copy()
+    undecided = visible[x, y]
+    for cx, cy in ((x + dx, y + dy), (x + dx, y), (x, y + dy)):
+        is_player = (cx == px) & (cy == py)
+        ok = undecided & (is_player | (walkable[cx, cy] & ~occupied[cx, cy]))
+        dest[ok, 0] = cx[ok]
+        dest[ok, 1] = cy[ok]
+        undecided &= ~ok
+
+    return dest
+
+
+def _attach(descriptor: ArrayDescriptor) -> np.ndarray:
+    """
+    Returns:
+        np.ndarray: A read-only view of an array published in shared memory.
+    """
+    key, name, shape, dtype = descriptor
+    block = _attached.get(key)
+    if block is None or block.name != name:
+        if block is not None:
+            block.close()
+        block = shared_memory.SharedMemory(name=name)
+        _attached[key] = block
+    array: np.ndarray = np.ndarray(shape, dtype=dtype, buffer=block.buf)
+    array.flags.writeable = False
+    return array
+
+
+def _propose_slice(
+    task: t.Tuple[
+        ArrayDescriptor,
+        ArrayDescriptor,
+        ArrayDescriptor,
+        ArrayDescriptor,
+        t.Tuple[int, int],
+        int,
+        int,
+    ]
+) -> np.ndarray:
+    """
+    Worker entry point: runs propose_moves over the snapshot published in
+        shared memory.
+    """
+    walkable, visible, occupied, positions, player_xy, start, stop = task
+    return propose_moves(
+        _attach(walkable),
+        _attach(visible),
+        _attach(occupied),
+        _attach(positions),
+        player_xy,
+        start,
+        stop)
+
+
+class SharedSnapshot:
+    """
+    SharedSnapshot publishes arrays in shared memory, so worker processes can
+        read them without having them pickled on every turn. Each array is
+        kept in its own block, which is reused from turn to turn and only
+        replaced when the array outgrows it.
+    Properties:
+        blocks (Dict[str, SharedMemory]): The shared memory blocks, by array
+            name.
+    """
+    def __init__(self) -> None:
+        self.blocks: t.Dict[str, shared_memory.SharedMemory] = {}
+
+    def publish(self, key: str, array: np.ndarray) -> ArrayDescriptor:
+        """
+        Copy an array into its shared memory block.
+        Parameters:
+            key (str): The name of the array.
+            array (np.ndarray): The array to publish.
+        Returns:
+            ArrayDescriptor: What a worker needs to attach to the array.
+        """
+        block = self.blocks.get(key)
+        if block is None or block.size < array.nbytes:
+            if block is not None:
+                block.close()
+                block.unlink()
+            block = shared_memory.SharedMemory(
+                create=True, size=max(array.nbytes, 1))
+            self.blocks[key] = block
+
+        view: np.ndarray = np.ndarray(
+            array.shape, dtype=array.dtype, buffer=block.buf)
+        view[...] = array
+        return key, block.name, array.shape, array.dtype.str
+
+    def close(self) -> None:
+        """
+        Release all the shared memory blocks.
+        """
+        for block in self.blocks.values():
+            block.close()
+            block.unlink()
+        self.blocks.clear()
+
+
+class MonsterAI:
+    """
+    MonsterAI decides and performs the monsters' turns. Every monster decides
+        its move from the same start-of-turn state, so the decisions can be
+        computed in any order, or in parallel by worker processes. Conflicts
+        (e.g. two monsters stepping into the same tile) are then resolved on
+        the main process, in a fixed order, so the parallel mode gives the
+        same results as the serial one.
+    Properties:
+        workers (int): Number of worker processes. With 0 workers, the moves
+            are computed on the main process.
+        snapshot (SharedSnapshot): The map snapshot shared with the workers.
+    Note:
+        The actors' positions, and the grid of the tiles they stand on, are
+            kept in arrays from turn to turn, and updated with the moves, so
+            they are not rebuilt from the entities on every turn. They are
+            rebuilt when the map, its set of entities, or its moved counter
+            (see GameMap.mark_moved) changes.
+    """
+    def __init__(self, workers: int = 0) -> None:
+        self.workers = workers
+        self.snapshot = SharedSnapshot()
+        self._pool: t.Optional[multiprocessing.pool.Pool] = None
+
+        self._game_map: t.Optional[GameMap] = None
+        self._entities: t.Set[Entity] = set()
+        self._moved = 0
+        self._actors: t.List[Entity] = []
+        self._positions = np.zeros((0, 2), dtype=np.intp)
+        self._occupied = np.zeros((0, 0), dtype=bool)
+
+    def take_turns(self, engine: Engine) -> None:
+        """
+        Let every monster in the engine's map take its turn.
+        Parameters:
+            engine (Engine): The engine whose monsters are taking turns.
+        """
+        game_map = engine.game_map
+        player = engine.player
+        self._track(game_map, player)
+        if not self._actors:
+            return
+
+        player_xy = (player.x, player.y)
+        if self.workers > 0:
+            dest = self._propose_in_parallel(
+                game_map.tiles["walkable"], game_map.visible, player_xy)
+        else:
+            dest = propose_moves(
+                game_map.tiles["walkable"],
+                game_map.visible,
+                self._occupied,
+                self._positions,
+                player_xy,
+                0,
+                len(self._actors))
+
+        self._resolve(engine, dest)
+
+    def _track(self, game_map: GameMap, player: Entity) -> None:
+        """
+        Rebuild the actors' positions and the occupied grid from the map's
+            entities, unless they are still up to date. The actors are kept
+            in (x, y) order.
+        """
+        if (
+            game_map is self._game_map
+            and game_map.moved == self._moved
+            and game_map.entities == self._entities
+        ):
+            return
+
+        self._game_map = game_map
+        self._entities = set(game_map.entities)
+        self._moved = game_map.moved
+        self._actors = sorted(
+            game_map.entities - {player}, key=lambda e: (e.x, e.y))
+        self._positions = np.array(
+            [(e.x, e.y) for e in self._actors], dtype=np.intp
+        ).reshape(-1, 2)
+        self._occupied = np.zeros(
+            (game_map.width, game_map.height), dtype=bool, order="F")
+        self._occupied[self._positions[:, 0], self._positions[:, 1]] = True
+
+    def _propose_in_parallel(
+        self,
+        walkable: np.ndarray,
+        visible: np.ndarray,
+        player_xy: t.Tuple[int, int],
+    ) -> np.ndarray:
+        """
+        Publish the snapshot and have the workers compute the proposed moves,
+            one contiguous slice of actors per worker.
+        """
+        if self._pool is None:
+            # Workers must share our resource tracker, otherwise each one
+            # unlinks the blocks it attached to when it exits.
+            resource_tracker.ensure_running()
+            self._pool = multiprocessing.Pool(self.workers)
+
+        shared = (
+            self.snapshot.publish("walkable", walkable),
+            self.snapshot.publish("visible", visible),
+            self.snapshot.publish("occupied", self._occupied),
+            self.snapshot.publish("positions", self._positions),
+        )
+
+        count = len(self._positions)
+        bounds = np.linspace(0, count, self.workers + 1, dtype=int)
+        tasks = [
+            (*shared, player_xy, int(a), int(b))
+            for a, b in zip(bounds[:-1], bounds[1:])
+            if a < b
+        ]
+        return np.concatenate(self._pool.map(_propose_slice, tasks))
+
+    def _resolve(self, engine: Engine, dest: np.ndarray) -> None:
+        """
+        Apply the proposed moves. Monsters stepping into the player attack it.
+            When several monsters want the same tile, the one standing first
+            in (x, y) order at the start of the turn gets it, and the others
+            stay put.
+        """
+        player = engine.player
+        positions = self._positions
+        height = engine.game_map.height
+
+        attacks = (dest[:, 0] == player.x) & (dest[:, 1] == player.y)
+        moves = np.flatnonzero(~attacks & np.any(dest != positions, axis=1))
+
+        # Sort the moves by destination, then by starting tile, and keep the
+        # first move into each destination.
+        tiles = engine.game_map.width * height
+        start_keys = positions[moves, 0] * height + positions[moves, 1]
+        dest_keys = dest[moves, 0] * height + dest[moves, 1]
+        order = np.argsort(dest_keys * tiles + start_keys, kind="stable")
+        sorted_dest = dest_keys[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_dest[1:] != sorted_dest[:-1]
+        winners = moves[order[first]]
+
+        attackers = np.flatnonzero(attacks)
+        attackers = attackers[np.lexsort(
+            (positions[attackers, 1], positions[attackers, 0]))]
+        engine.player_attacked = bool(len(attackers))
+        for i in attackers.tolist():
+            engine.message_log.add_message(
+                f"The {self._actors[i].name} kicks you, much to your "
+                f"annoyance!",
+                color.enemy_atk)
+
+        self._occupied[positions[winners, 0], positions[winners, 1]] = False
+        self._occupied[dest[winners, 0], dest[winners, 1]] = True
+        positions[winners] = dest[winners]
+
+        actors = self._actors
+        for i, (x, y) in zip(winners.tolist(), dest[winners].tolist()):
+            actor = actors[i]
+            actor.x = x
+            actor.y = y
+
+    def close(self) -> None:
+        """
+        Stop the worker processes and release the shared memory.
+        """
+        if self._pool is not None:
+            self._pool.close()
+            self._pool.join()
+            self._pool = None
+        self.snapshot.close()
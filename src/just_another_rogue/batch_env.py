@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import copy
+import numpy as np
+import random
+import typing as t
+
+from just_another_rogue import entity_factories
+from just_another_rogue import tile_types
+from just_another_rogue.actions import BumpAction
+from just_another_rogue.engine import Engine
+from just_another_rogue.procgen import generate_dungeon
+
+"""
+The moves an agent can pick from, indexed by action number: wait, then the
+    four cardinal directions, then the four diagonals.
+"""
+DIRECTIONS = np.array(
+    [
+        (0, 0),
+        (0, -1),
+        (0, 1),
+        (-1, 0),
+        (1, 0),
+        (-1, -1),
+        (1, -1),
+        (-1, 1),
+        (1, 1),
+    ],
+    dtype=np.int32,
+)
+
+
+class BatchEnv:
+    """
+    BatchEnv runs many games side by side, for training agents. Each game has
+        its own Engine, but the maps' arrays are views into stacked arrays
+        owned by the BatchEnv, so the games write their state straight into
+        the observations and nothing is copied to build them. Those arrays
+        are pinned (see GameMap.pinned), so they stay attached even after the
+        engines are forked, snapshotted or restored.
+    Properties:
+        num_envs (int): How many games are run.
+        engines (List[Engine]): The engine of each game.
+        tiles (np.ndarray): (num_envs, width, height) array of every map's
+            tiles.
+        visible (np.ndarray): (num_envs, width, height) array of the tiles the
+            player can see in each game.
+        explored (np.ndarray): (num_envs, width, height) array of the tiles the
+            player has seen before in each game.
+        entities (np.ndarray): (num_envs, width, height) array holding, for
+            each tile, the character code of the entity standing on it, or 0.
+        observations (Dict[str, np.ndarray]): The arrays above, plus views of
+            the walkable and transparent layers of the tiles. The same arrays
+            are returned by every call to reset and step.
+    """
+    def __init__(
+        self,
+        num_envs: int,
+        map_width: int = 80,
+        map_height: int = 43,
+        max_rooms: int = 30,
+        room_min_size: int = 6,
+        room_max_size: int = 10,
+        max_monster_per_room: int = 2,
+    ) -> None:
+        self.num_envs = num_envs
+        self.map_width = map_width
+        self.map_height = map_height
+        self.max_rooms = max_rooms
+        self.room_min_size = room_min_size
+        self.room_max_size = room_max_size
+        self.max_monster_per_room = max_monster_per_room
+
+        shape = (num_envs, map_width, map_height)
+        self.tiles = np.full(shape, fill_value=tile_types.wall)
+        self.visible = np.zeros(shape, dtype=bool)
+        self.explored = np.zeros(shape, dtype=bool)
+        self.entities = np.zeros(shape, dtype=np.int32)
+        self.engines: t.List[Engine] = []
+        self._drawn: t.List[t.Tuple[t.List[int], t.List[int]]] = []
+
+        self.observations: t.Dict[str, np.ndarray] = {
+            "walkable": self.tiles["walkable"],
+            "transparent": self.tiles["transparent"],
+            "visible": self.visible,
+            "explored": self.explored,
+            "entities": self.entities,
+        }
+
+    def reset(self, seed: t.Optional[int] = None) -> t.Dict[str, np.ndarray]:
+        """
+        Start a new game in every environment.
+        Parameters:
+            seed (Optional[int]): Seed for the dungeon generation, and for
+                each engine's random number generator.
+        Returns:
+            Dict[str, np.ndarray]: The observations.
+        """
+        if seed is not None:
+            random.seed(seed)
+
+        self.engines = [
+            self._new_game(i, seed) for i in range(self.num_envs)]
+        self.entities[...] = 0
+        self._drawn = [([], []) for _ in range(self.num_envs)]
+        self._update_entities()
+        return self.observations
+
+    def _new_game(self, index: int, seed: t.Optional[int] = None) -> Engine:
+        """
+        Generate a new game and move its map's arrays into the stacked arrays.
+        Parameters:
+            index (int): The environment the game is for.
+            seed (Optional[int]): The seed given to reset, if any.
+        Returns:
+            Engine: The engine of the new game.
+        """
+        engine = Engine(
+            copy.deepcopy(entity_factories.player),
+            seed=None if seed is None else (seed, index))
+        game_map = generate_dungeon(
+            max_rooms=self.max_rooms,
+            room_min_size=self.room_min_size,
+            room_max_size=self.room_max_size,
+            map_width=self.map_width,
+            map_heigth=self.map_height,
+            max_monster_per_room=self.max_monster_per_room,
+            engine=engine)
+
+        self.tiles[index] = game_map.tiles
+        self.visible[index] = False
+        self.explored[index] = False
+        game_map.tiles = self.tiles[index]
+        game_map.visible = self.visible[index]
+        game_map.explored = self.explored[index]
+        game_map.pinned = {"tiles", "visible", "explored"}
+
+        engine.game_map = game_map
+        engine.update_fov()
+        return engine
+
+    def step(self, actions: t.Sequence[int]) -> t.Dict[str, np.ndarray]:
+        """
+        Play one turn in every environment.
+        Parameters:
+            actions (Sequence[int]): One action per environment, indexing
+                DIRECTIONS.
+        Returns:
+            Dict[str, np.ndarray]: The observations.
+        """
+        moves = DIRECTIONS[np.asarray(actions)].tolist()
+
+        for engine, (dx, dy) in zip(self.engines, moves):
+            if dx or dy:
+                BumpAction(engine.player, dx, dy).perform()
+            engine.handle_enemy_turns()
+            engine.update_fov()
+
+        self._update_entities()
+        return self.observations
+
+    def _update_entities(self) -> None:
+        """
+        Redraw the entity layer from the entities' positions. Only the tiles
+            drawn on the previous update are cleared.
+        """
+        for i, (layer, engine) in enumerate(zip(self.entities, self.engines)):
+            layer[self._drawn[i]] = 0
+            entities = engine.game_map.entities
+            xs = [entity.x for entity in entities]
+            ys = [entity.y for entity in entities]
+            layer[xs, ys] = [ord(entity.char) for entity in entities]
+            self._drawn[i] = (xs, ys)
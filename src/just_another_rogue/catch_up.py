@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+import math
+import numpy as np
+import typing as t
+
+from just_another_rogue import entity_factories
+
+if t.TYPE_CHECKING:
+    from just_another_rogue.entity import Entity
+    from just_another_rogue.game_map import GameMap
+
+"""
+Per-axis variance of one step of a monster wandering around a level the
+    player is not on: it picks one of its 8 neighbours or stays put, each with
+    the same chance.
+"""
+WANDER_VARIANCE = 6 / 9
+
+"""
+How many times a monster tries to find a free tile to wander to before it
+    stays where it was.
+"""
+WANDER_ATTEMPTS = 4
+
+"""
+Chance of a respawned monster being an orc (otherwise it is a troll), as in
+    procgen.place_entities.
+"""
+ORC_CHANCE = 0.8
+
+
+def catch_up(
+    game_map: GameMap,
+    elapsed_turns: int,
+    rng: t.Optional[np.random.Generator] = None,
+    respawn_interval: int = 200,
+) -> None:
+    """
+    Apply, in bulk, the turns that went by on a level while the player was
+        away, instead of replaying them one by one. Monsters wander randomly
+        while the player is away, so after n turns each one is moved to a free
+        walkable tile drawn from the spread of an n-step random walk around
+        its position (or from anywhere on the level, once the walk is long
+        enough to have crossed it). Then one monster respawns every
+        respawn_interval turns, until the level is back to its max_monsters.
+    Parameters:
+        game_map (GameMap): The level to catch up.
+        elapsed_turns (int): How many turns went by since the player left it.
+        rng (Optional[Generator]): The random number generator to use.
+        respawn_interval (int): Turns it takes for one monster to respawn.
+    """
+    if elapsed_turns <= 0:
+        return
+    if rng is None:
+        rng = np.random.default_rng()
+
+    player = game_map.engine.player
+    # Sorted, so that a seeded rng always moves the monsters the same way.
+    monsters = sorted(
+        (e for e in game_map.entities if e is not player),
+        key=lambda e: (e.x, e.y))
+    occupied = np.zeros((game_map.width, game_map.height), dtype=bool)
+    for entity in game_map.entities:
+        occupied[entity.x, entity.y] = True
+
+    _wander(game_map, monsters, occupied, elapsed_turns, rng)
+
+    respawns = min(
+        game_map.max_monsters - len(monsters),
+        elapsed_turns // respawn_interval)
+    if respawns > 0:
+        _respawn(game_map, occupied, respawns, rng)
+
+
+def _wander(
+    game_map: GameMap,
+    monsters: t.List[Entity],
+    occupied: np.ndarray,
+    elapsed_turns: int,
+    rng: np.random.Generator,
+) -> None:
+    """
+    Move every monster to where elapsed_turns of wandering could take it.
+        When two monsters pick the same tile, the first one gets it and the
+        other tries again. occupied is kept up to date.
+    """
+    if not monsters:
+        return
+
+    walkable = game_map.tiles["walkable"]
+    width, height = game_map.width, game_map.height
+    sigma = math.sqrt(WANDER_VARIANCE * elapsed_turns)
+    floor = np.argwhere(walkable) if sigma >= max(width, height) / 2 else None
+
+    positions = np.array([(e.x, e.y) for e in monsters], dtype=np.intp)
+    destinations = positions.copy()
+    pending = np.arange(len(monsters))
+
+    for _ in range(WANDER_ATTEMPTS):
+        if floor is None:
+            offsets = np.rint(rng.normal(0, sigma, (len(pending), 2)))
+            candidates = positions[pending] + offsets.astype(np.intp)
+            np.clip(candidates[:, 0], 0, width - 1, out=candidates[:, 0])
+            np.clip(candidates[:, 1], 0, height - 1, out=candidates[:, 1])
+        else:
+            candidates = floor[rng.integers(len(floor), size=len(pending))]
+
+        cx, cy = candidates[:, 0], candidates[:, 1]
+        ok = np.flatnonzero(walkable[cx, cy] & ~occupied[cx, cy])
+        _, first = np.unique(cx[ok] * height + cy[ok], return_index=True)
+        won = ok[first]
+
+        movers = pending[won]
+        occupied[positions[movers, 0], positions[movers, 1]] = False
+        occupied[cx[won], cy[won]] = True
+        destinations[movers] = candidates[won]
+
+        pending = np.delete(pending, won)
+        if not len(pending):
+            break
+
+    for i in np.flatnonzero(np.any(destinations != positions, axis=1)):
+        monsters[i].x = int(destinations[i, 0])
+        monsters[i].y = int(destinations[i, 1])
+    game_map.mark_moved()
+
+
+def _respawn(
+    game_map: GameMap,
+    occupied: np.ndarray,
+    count: int,
+    rng: np.random.Generator,
+) -> None:
+    """
+    Spawn up to count monsters on free walkable tiles.
+    """
+    free = np.argwhere(game_map.tiles["walkable"] & ~occupied)
+    count = min(count, len(free))
+    chosen = free[rng.choice(len(free), size=count, replace=False)]
+    is_orc = rng.random(count) < ORC_CHANCE
+
+    for (x, y), orc in zip(chosen.tolist(), is_orc.tolist()):
+        monster = entity_factories.orc if orc else entity_factories.troll
+        monster.spaws(game_map, x, y)
+        occupied[x, y] = True
@@ -0,0 +1,10 @@
+"""
+Colors used across the game, as RGB tuples.
+"""
+white = (0xFF, 0xFF, 0xFF)
+black = (0x0, 0x0, 0x0)
+
+player_atk = (0xE0, 0xE0, 0xE0)
+enemy_atk = (0xFF, 0xC0, 0xC0)
+
+welcome_text = (0x20, 0xA0, 0xFF)
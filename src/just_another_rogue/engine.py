@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import copy
+import numpy as np
 import typing as t
 from tcod.console import Console
 from tcod.context import Context
 from tcod.map import compute_fov
 
+from just_another_rogue.ai import MonsterAI
+from just_another_rogue.catch_up import catch_up
 from just_another_rogue.input_handlers import EventHandler
+from just_another_rogue.message_log import MessageLog
+from just_another_rogue.visibility_atlas import fov_window
 
 if t.TYPE_CHECKING:
     from just_another_rogue.entity import Entity
-    from just_another_rogue.game_map import GameMap
+    from just_another_rogue.game_map import GameMap, MapSnapshot
 
 
 class Engine:
@@ -21,47 +27,218 @@ class Engine:
             it outside of entities for ease of access. We'll need to access
             player a lot more than a random entity in entities.
         event_handler (EventHandler): It will handle our events.
+        message_log (MessageLog): The log of messages shown to the player.
+        ai (MonsterAI): Decides and performs the monsters' turns.
         game_map (GameMap): The representation of the map.
+        fov_radius (int): How far the player can see.
+        turn (int): How many turns have been played.
+        player_attacked (bool): Whether the player was attacked during the
+            last enemies' turn.
+    Parameters:
+        ai_workers (int): Number of worker processes used to compute the
+            monsters' moves. With 0 (the default), they are computed on the
+            main process.
+        seed (Optional[Union[int, Sequence[int]]]): Seed for rng, so that
+            games can be replayed. Without one, rng is seeded from the OS.
     """
-    def __init__(self, player: Entity) -> None:
+    fov_radius = 8
+
+    def __init__(
+        self,
+        player: Entity,
+        ai_workers: int = 0,
+        seed: t.Optional[t.Union[int, t.Sequence[int]]] = None,
+    ) -> None:
         self.player = player
         self.event_handler = EventHandler(self)
+        self.message_log = MessageLog()
+        self.ai = MonsterAI(workers=ai_workers)
+        self.turn = 0
+        self._seed = seed
+        self._rng: t.Optional[np.random.Generator] = None
+        self.player_attacked = False
         self.game_map: GameMap
 
+    @property
+    def rng(self) -> np.random.Generator:
+        """
+        Returns:
+            np.random.Generator: The random number generator used by the game
+                itself, e.g. for the levels catching up when the player comes
+                back. It is only created the first time it is needed.
+        """
+        if self._rng is None:
+            self._rng = np.random.default_rng(self._seed)
+        return self._rng
+
+    @property
+    def rng_state(self) -> t.Optional[t.Mapping[str, t.Any]]:
+        """
+        Returns:
+            Optional[Mapping[str, Any]]: The state of rng, or None if it was
+                not created yet. Setting it rolls rng back to that state.
+        """
+        if self._rng is None:
+            return None
+        return self._rng.bit_generator.state
+
+    @rng_state.setter
+    def rng_state(self, state: t.Optional[t.Mapping[str, t.Any]]) -> None:
+        if state is None:
+            self._rng = None
+        else:
+            self.rng.bit_generator.state = state
+
+    def __enter__(self) -> Engine:
+        return self
+
+    def __exit__(self, *exc_info: t.Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the resources held by this engine: the monsters' AI worker
+            processes and their shared memory. The engine can also be used as
+            a context manager, which closes it on exit.
+        """
+        self.ai.close()
+
     def handle_enemy_turns(self) -> None:
         """
-        This function loops through each entity (minus the player) and prints
-            out a message for them. TODO: Replacee this with some code that
-            will allow those entities to take real turns.
+        Let every entity (minus the player) take its turn. Entities the
+            player can see step towards the player, or attack it when they are
+            next to it.
+        """
+        self.player_attacked = False
+        self.ai.take_turns(self)
+        self.turn += 1
+
+    def enter_level(self, game_map: GameMap, x: int, y: int) -> None:
+        """
+        Move the player to another level. The level being left remembers the
+            current turn, and a level the player comes back to is caught up
+            with the turns that went by since (see catch_up.catch_up). A
+            monster standing on the arrival tile is moved out of the way.
+        Parameters:
+            game_map (GameMap): The level to enter.
+            x (int): The x coordinate the player arrives at.
+            y (int): The y coordinate the player arrives at.
         """
-        for entity in self.game_map.entities - {self.player}:
-            print(
-                f"The {entity.name} wonders when "
-                "it will get to take a real turn.")
+        if hasattr(self, "game_map"):
+            self.game_map.last_turn = self.turn
+
+        game_map.clear_tile(x, y)
+        self.player.place(x, y, game_map)
+        if game_map.last_turn is not None:
+            catch_up(game_map, self.turn - game_map.last_turn, self.rng)
+            game_map.last_turn = None
+
+        self.game_map = game_map
+        self.update_fov()
 
     def update_fov(self) -> None:
         """
-        Recumpute the visible area based on the players point of vew.
+        Recumpute the visible area based on the players point of vew. If the
+            map has a ready visibility atlas with the same radius, the field
+            of view is looked up instead, and only the windows around the
+            previous and current fields of view are touched.
         """
-        self.game_map.visible[:] = compute_fov(
-            self.game_map.tiles["transparent"],
-            (self.player.x, self.player.y),
-            radius=8)
+        game_map = self.game_map
+        x, y = self.player.x, self.player.y
+        atlas = game_map.visibility_atlas
+
+        if (
+            atlas is not None
+            and atlas.radius == self.fov_radius
+            and atlas.covers(x, y)
+        ):
+            visible = game_map.writable("visible")
+            visible[game_map.fov_window] = False
+            atlas.fill(visible, x, y)
+        else:
+            # Every tile is recomputed, so a shared array is replaced rather
+            # than copied first.
+            visible = game_map.replace("visible", compute_fov(
+                game_map.tiles["transparent"], (x, y), radius=self.fov_radius))
+
+        window = fov_window(
+            x, y, self.fov_radius, game_map.width, game_map.height)
+        game_map.fov_window = window
 
         # If a tile is "visible" it should be added to "explored".
-        self.game_map.explored |= self.game_map.visible
+        # Shared arrays are only copied when something new was explored.
+        if (visible[window] & ~game_map.explored[window]).any():
+            explored = game_map.writable("explored")
+            explored[window] |= visible[window]
+            game_map.mark_explored(window)
+
+    def fork(self) -> Engine:
+        """
+        Create a copy of this engine that can play on without affecting this
+            one, e.g. to look ahead when searching for the best action. The
+            map arrays are shared copy-on-write (see GameMap.fork), and only
+            the entities and rng are copied. The fork starts with an empty
+            message log, and always computes the monsters' moves on the main
+            process.
+        Returns:
+            Engine: The new engine.
+        """
+        engine = Engine(copy.copy(self.player))
+        engine.turn = self.turn
+        engine._seed = self._seed
+        engine._rng = copy.deepcopy(self._rng)
+        engine.game_map = self.game_map.fork(engine)
+        return engine
+
+    def snapshot(self) -> MapSnapshot:
+        """
+        Returns:
+            MapSnapshot: The current state of the game map, the turn and
+                rng, which can later be rolled back to with restore. The
+                message log and the other levels are not part of it.
+        """
+        return self.game_map.snapshot()
+
+    def restore(self, snapshot: MapSnapshot) -> None:
+        """
+        Roll the game map, the turn and rng back to a snapshot taken with
+            the snapshot method. If the player changed levels since, they go
+            back to the level the snapshot was taken on, and the level they
+            leave is treated as left on the restored turn.
+        Parameters:
+            snapshot (MapSnapshot): The snapshot to roll back to.
+        Note:
+            Raises ValueError if the snapshot was taken by another engine
+                (e.g. a fork of this one).
+        """
+        game_map = snapshot.game_map
+        if game_map.engine is not self:
+            raise ValueError("The snapshot was taken by another engine.")
+
+        if game_map is not self.game_map:
+            self.game_map.entities.discard(self.player)
+            self.game_map.last_turn = snapshot.turn
+            game_map.last_turn = None
+            self.game_map = game_map
+        game_map.restore(snapshot)
 
     def render(self, console: Console, context: Context) -> None:
         """
         Render handles drawing our screen. call for the GameMap's render
             method. And then we iterate through the self.entities
-            and print them to ther proper locations, then present the context,
-            and clear the console.
+            and print them to ther proper locations, draw the message log
+            below the map, then present the context, and clear the console.
         Parameters:
             console (Console): A console object containing a grid of characters
                 with foreground/background colors.
             context (Context): Context manager for libtcod context objects.
         """
         self.game_map.render(console)
+        self.message_log.render(
+            console=console,
+            x=0,
+            y=self.game_map.height + 1,
+            width=console.width,
+            height=console.height - self.game_map.height - 1)
         context.present(console)
         console.clear()
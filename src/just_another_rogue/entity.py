@@ -78,6 +78,8 @@ class Entity:
         """
         self.x = x
         self.y = y
+        if hasattr(self, "game_map"):
+            self.game_map.mark_moved()
         if game_map:
             if hasattr(self, "game_map"):
                 self.game_map.entities.remove(self)
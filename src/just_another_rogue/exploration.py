@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import numpy as np
+import tcod
+import typing as t
+
+if t.TYPE_CHECKING:
+    from just_another_rogue.game_map import GameMap
+
+
+def find_path(
+    game_map: GameMap,
+    start: t.Tuple[int, int],
+    goals: np.ndarray,
+) -> t.List[t.Tuple[int, int]]:
+    """
+    Find the shortest path from start to the nearest goal tile, walking only
+        over explored walkable tiles.
+    Parameters:
+        game_map (GameMap): The map to walk over.
+        start (Tuple[int, int]): The starting position.
+        goals (np.ndarray): Boolean mask of the goal tiles.
+    Returns:
+        List[Tuple[int, int]]: The positions to walk through, excluding start.
+            Empty if no goal can be reached.
+    """
+    cost = (game_map.explored & game_map.tiles["walkable"]).astype(np.int8)
+    distance = tcod.path.maxarray(goals.shape, order="F")
+    distance[goals] = 0
+    tcod.path.dijkstra2d(distance, cost, 2, 3, out=distance)
+
+    if distance[start] == np.iinfo(distance.dtype).max:
+        return []
+
+    path = tcod.path.hillclimb2d(distance, start, True, True).tolist()
+    return [(x, y) for x, y in path[1:]]
+
+
+class Explorer:
+    """
+    Explorer keeps track of the exploration frontier of a GameMap: the
+        explored walkable tiles that have at least one unexplored neighbour.
+        The frontier is updated incrementally: Engine.update_fov reports the
+        window it explored tiles in (see GameMap.mark_explored), and only
+        that area is recomputed. The path to the nearest frontier tile is
+        reused for as long as its target stays in the frontier.
+    Properties:
+        game_map (GameMap): The map being explored.
+        frontier (np.ndarray): Boolean mask of the frontier tiles.
+    Note:
+        The distance map a path comes from is still computed over the whole
+            map. It is needed again whenever the target of the current path
+            leaves the frontier, which on a typical level happens every 2 or
+            3 steps.
+    """
+    def __init__(self, game_map: GameMap) -> None:
+        self.game_map = game_map
+        self.frontier = np.full(
+            (game_map.width, game_map.height), fill_value=False, order="F")
+        self._path: t.List[t.Tuple[int, int]] = []
+        self._expected_xy: t.Optional[t.Tuple[int, int]] = None
+        # The area explored since the last update, as (x0, x1, y0, y1). The
+        # whole map at first, as the explorer starts with an empty frontier.
+        self._dirty: t.Optional[t.Tuple[int, int, int, int]] = (
+            0, game_map.width, 0, game_map.height)
+
+    def mark_explored(self, window: t.Tuple[slice, slice]) -> None:
+        """
+        Note that tiles were explored inside window, so the frontier is
+            recomputed there on the next update.
+        Parameters:
+            window (Tuple[slice, slice]): The area holding the new tiles.
+        """
+        wx, wy = window
+        if self._dirty is None:
+            self._dirty = (wx.start, wx.stop, wy.start, wy.stop)
+        else:
+            x0, x1, y0, y1 = self._dirty
+            self._dirty = (
+                min(x0, wx.start), max(x1, wx.stop),
+                min(y0, wy.start), max(y1, wy.stop))
+
+    def update(self) -> None:
+        """
+        Bring the frontier up to date with the map's explored tiles. Only the
+            area explored since the last update (plus a 1 tile border) is
+            recomputed.
+        """
+        if self._dirty is None:
+            return
+        x0, x1, y0, y1 = self._dirty
+        self._dirty = None
+
+        x0, x1 = max(x0 - 1, 0), min(x1 + 1, self.game_map.width)
+        y0, y1 = max(y0 - 1, 0), min(y1 + 1, self.game_map.height)
+        self.frontier[x0:x1, y0:y1] = self._compute_frontier(x0, x1, y0, y1)
+
+    def _compute_frontier(
+        self, x0: int, x1: int, y0: int, y1: int
+    ) -> np.ndarray:
+        """
+        Returns:
+            np.ndarray: The frontier mask over [x0:x1, y0:y1]. Tiles outside
+                the map count as explored.
+        """
+        width, height = self.game_map.width, self.game_map.height
+        ax0, ax1 = max(x0 - 1, 0), min(x1 + 1, width)
+        ay0, ay1 = max(y0 - 1, 0), min(y1 + 1, height)
+        pad_x = (1 - (x0 - ax0), 1 - (ax1 - x1))
+        pad_y = (1 - (y0 - ay0), 1 - (ay1 - y1))
+        unexplored = np.pad(
+            ~self.game_map.explored[ax0:ax1, ay0:ay1],
+            (pad_x, pad_y),
+            constant_values=False)
+
+        w, h = x1 - x0, y1 - y0
+        near_unexplored = np.zeros((w, h), dtype=bool)
+        for dx in (0, 1, 2):
+            for dy in (0, 1, 2):
+                near_unexplored |= unexplored[dx:dx + w, dy:dy + h]
+
+        return (
+            self.game_map.explored[x0:x1, y0:y1]
+            & self.game_map.tiles["walkable"][x0:x1, y0:y1]
+            & near_unexplored
+        )
+
+    def next_step(self, x: int, y: int) -> t.Optional[t.Tuple[int, int]]:
+        """
+        Parameters:
+            x (int): The x coordinate of the explorer's current position.
+            y (int): The y coordinate of the explorer's current position.
+        Returns:
+            Optional[Tuple[int, int]]: The next position on the way to the
+                nearest frontier tile, or None if nothing is left to explore.
+        """
+        self.update()
+
+        if (
+            not self._path
+            or self._expected_xy != (x, y)
+            or not self.frontier[self._path[-1]]
+        ):
+            self._path = find_path(self.game_map, (x, y), self.frontier)
+            if not self._path:
+                return None
+
+        self._expected_xy = self._path.pop(0)
+        return self._expected_xy
@@ -1,16 +1,58 @@
 from __future__ import annotations
 
+import copy
 import numpy as np
 import typing as t
 from tcod.console import Console
 
 from just_another_rogue import tile_types
+from just_another_rogue.exploration import Explorer
+from just_another_rogue.visibility_atlas import VisibilityAtlas
 
 if t.TYPE_CHECKING:
     from just_another_rogue.engine import Engine
     from just_another_rogue.entity import Entity
 
 
+class MapSnapshot:
+    """
+    MapSnapshot holds the state of a GameMap at some point, so the map can be
+        rolled back to it with GameMap.restore.
+    Properties:
+        game_map (GameMap): The map the snapshot was taken on.
+        entities (List[Tuple[Entity, int, int]]): Every entity on the map, with
+            its position.
+        visible (np.ndarray): Read-only view of the visible tiles.
+        explored (np.ndarray): Read-only view of the explored tiles.
+        fov_window (Tuple[slice, slice]): The area holding the visible tiles.
+        turn (int): The engine's turn when the snapshot was taken.
+        rng_state (Optional[Mapping[str, Any]]): Engine.rng_state when the
+            snapshot was taken.
+    Note:
+        Only the level the snapshot was taken on is part of it. Other levels
+            keep the last_turn they were left on, so after rolling back the
+            turn they catch up on fewer turns, or none, when the player comes
+            back.
+    """
+    def __init__(
+        self,
+        game_map: GameMap,
+        entities: t.List[t.Tuple[Entity, int, int]],
+        visible: np.ndarray,
+        explored: np.ndarray,
+        fov_window: t.Tuple[slice, slice],
+        turn: int,
+        rng_state: t.Optional[t.Mapping[str, t.Any]],
+    ) -> None:
+        self.game_map = game_map
+        self.entities = entities
+        self.visible = visible
+        self.explored = explored
+        self.fov_window = fov_window
+        self.turn = turn
+        self.rng_state = rng_state
+
+
 class GameMap:
     """
     Class GameMap holds information regarding the map size and tiles. Has
@@ -26,6 +68,31 @@ class GameMap:
         tiles (np.ndarray): 2D array filled with tiles representing the wall.
         visible (np.ndarray): Tiles the player can currently see
         explored (np.ndarray): Tiles the player has seen before
+        fov_window (Tuple[slice, slice]): The area of the map that holds all
+            the visible tiles, so only this area needs to be cleared when the
+            field of view changes.
+        visibility_atlas (Optional[VisibilityAtlas]): The precomputed fields of
+            view of this map, if any. See build_visibility_atlas.
+        max_monsters (int): How many monsters this map holds when fully
+            populated. Monsters respawn up to this number.
+        last_turn (Optional[int]): The turn the player left this map on, or
+            None if the player is on it (or never was).
+        pinned (Set[str]): Names of the copy-on-write arrays that are views
+            into arrays owned by someone else (see BatchEnv), and must stay
+            attached to them. Those are written in place, never replaced.
+        moved (int): Counts the times entities were moved other than by
+            their own turns. See mark_moved.
+    Note:
+        The tiles, visible and explored arrays are copy-on-write. A fork or
+            a snapshot gets read-only views of them, and this map keeps its
+            own arrays, writable, but flagged as shared. The writable method
+            copies a shared (or read-only) array before handing it out, so
+            code writing to these arrays must go through it once the map has
+            been forked or snapshotted: writing to them directly would also
+            change the forks and snapshots. A forked or restored map holds
+            read-only views until it writes through writable. Pinned arrays
+            are the exception: forks and snapshots get read-only copies of
+            them, and restore copies the snapshot back into them.
     """
     def __init__(
         self,
@@ -47,6 +114,240 @@ class GameMap:
         self.explored = np.full(
             (width, height), fill_value=False, order="F")
 
+        self.fov_window = (slice(0, 0), slice(0, 0))
+        self.visibility_atlas: t.Optional[VisibilityAtlas] = None
+        self.max_monsters = 0
+        self.last_turn: t.Optional[int] = None
+        self.moved = 0
+        self._explorer: t.Optional[Explorer] = None
+        self.pinned: t.Set[str] = set()
+        self._shared: t.Set[str] = set()
+
+    @property
+    def explorer(self) -> Explorer:
+        """
+        Returns:
+            Explorer: Keeps track of the exploration frontier of this map. It
+                is only created the first time it is needed.
+        """
+        if self._explorer is None:
+            self._explorer = Explorer(self)
+        return self._explorer
+
+    def mark_explored(self, window: t.Tuple[slice, slice]) -> None:
+        """
+        Report that tiles were explored inside window, so the explorer, if
+            there is one, updates its frontier there. Code writing to the
+            explored tiles must call it.
+        Parameters:
+            window (Tuple[slice, slice]): The area holding the new tiles.
+        """
+        if self._explorer is not None:
+            self._explorer.mark_explored(window)
+
+    def mark_moved(self) -> None:
+        """
+        Report that entities were moved, or placed, other than by their own
+            turns (see MonsterAI), so the monsters' positions are looked up
+            again on the next turn. Code moving entities must call it.
+        """
+        self.moved += 1
+
+    def writable(self, name: str) -> np.ndarray:
+        """
+        Get one of the copy-on-write arrays ready to be written to.
+        Parameters:
+            name (str): The array name ("tiles", "visible" or "explored").
+        Returns:
+            np.ndarray: The array. If it was shared, it is copied first, and
+                the copy replaces it in this map. Pinned arrays are always
+                returned as they are.
+        Note:
+            Asking for the tiles drops the visibility atlas, as the walls may
+                be about to change.
+        """
+        if name == "tiles":
+            self.visibility_atlas = None
+        array: np.ndarray = getattr(self, name)
+        if name in self.pinned:
+            return array
+        if name in self._shared or not array.flags.writeable:
+            array = array.copy(order="F")
+            setattr(self, name, array)
+            self._shared.discard(name)
+        return array
+
+    def replace(self, name: str, array: np.ndarray) -> np.ndarray:
+        """
+        Replace one of the copy-on-write arrays with new content, as a cheaper
+            alternative to overwriting all of it through writable, which would
+            first copy a shared array only to throw the copy away.
+        Parameters:
+            name (str): The array name ("tiles", "visible" or "explored").
+            array (np.ndarray): The new content. It is owned by this map from
+                now on, unless it is a view (e.g. compute_fov returns a view
+                into a buffer three times its size), or the array is pinned:
+                then it is copied.
+        Returns:
+            np.ndarray: The array now held by this map.
+        """
+        if name == "tiles":
+            self.visibility_atlas = None
+        if name in self.pinned:
+            current: np.ndarray = getattr(self, name)
+            current[...] = array
+            return current
+        if array.base is not None:
+            array = array.copy(order="F")
+        setattr(self, name, array)
+        self._shared.discard(name)
+        return array
+
+    def _share(self, name: str) -> np.ndarray:
+        """
+        Share one of the copy-on-write arrays. This map keeps its array, but
+            flags it as shared, so its next write through writable copies it.
+        Returns:
+            np.ndarray: A read-only view of the array, or a read-only copy of
+                it if it is pinned, as it will be written in place.
+        """
+        array: np.ndarray = getattr(self, name)
+        if name in self.pinned:
+            view = array.copy(order="F")
+        else:
+            self._shared.add(name)
+            view = array.view()
+        view.flags.writeable = False
+        return view
+
+    def build_visibility_atlas(
+        self, radius: int, background: bool = False
+    ) -> VisibilityAtlas:
+        """
+        Precompute the field of view from every walkable tile, so
+            Engine.update_fov can look it up instead of computing it. Only
+            valid while the walls do not change.
+        Parameters:
+            radius (int): The field of view radius.
+            background (bool): If True, the atlas is built by a background
+                thread, and update_fov keeps computing the field of view until
+                it is ready.
+        Returns:
+            VisibilityAtlas: The new atlas, also stored in visibility_atlas.
+        """
+        atlas = VisibilityAtlas(
+            self.tiles["transparent"], self.tiles["walkable"], radius)
+        if background:
+            atlas.build_in_background()
+        else:
+            atlas.build()
+        self.visibility_atlas = atlas
+        return atlas
+
+    def fork(self, engine: Engine) -> GameMap:
+        """
+        Create a copy of this map, for the given engine, that can be changed
+            without affecting this one. The tiles, visible and explored arrays
+            are shared until either map writes to them. The entities are
+            copied, except the player, which is replaced by engine.player.
+        Parameters:
+            engine (Engine): The engine the new map is related to.
+        Returns:
+            GameMap: The new map.
+        """
+        clone = copy.copy(self)
+        clone.engine = engine
+        clone.tiles = self._share("tiles")
+        clone.visible = self._share("visible")
+        clone.explored = self._share("explored")
+        clone._explorer = None
+        clone.pinned = set()
+        clone._shared = set()
+        clone.entities = set()
+
+        for entity in self.entities:
+            if entity is self.engine.player:
+                entity_clone = engine.player
+                entity_clone.x, entity_clone.y = entity.x, entity.y
+            else:
+                entity_clone = copy.copy(entity)
+            entity_clone.game_map = clone
+            clone.entities.add(entity_clone)
+
+        return clone
+
+    def snapshot(self) -> MapSnapshot:
+        """
+        Returns:
+            MapSnapshot: The current state of this map. Taking a snapshot only
+                copies the entities' positions; the arrays are shared.
+        """
+        return MapSnapshot(
+            self,
+            [(entity, entity.x, entity.y) for entity in self.entities],
+            self._share("visible"),
+            self._share("explored"),
+            self.fov_window,
+            self.engine.turn,
+            self.engine.rng_state)
+
+    def restore(self, snapshot: MapSnapshot) -> None:
+        """
+        Roll this map back to a snapshot taken with the snapshot method. The
+            same snapshot can be restored any number of times.
+        Parameters:
+            snapshot (MapSnapshot): The snapshot to roll back to.
+        Note:
+            Raises ValueError if the snapshot was taken on another map. Use
+                Engine.restore to go back to the level a snapshot was taken
+                on.
+        """
+        if snapshot.game_map is not self:
+            raise ValueError("The snapshot was taken on another map.")
+
+        self.entities = set()
+        for entity, x, y in snapshot.entities:
+            entity.x, entity.y = x, y
+            entity.game_map = self
+            self.entities.add(entity)
+        self.mark_moved()
+
+        for name in ("visible", "explored"):
+            if name in self.pinned:
+                np.copyto(getattr(self, name), getattr(snapshot, name))
+            else:
+                setattr(self, name, getattr(snapshot, name))
+        self.fov_window = snapshot.fov_window
+        self.engine.turn = snapshot.turn
+        self.engine.rng_state = snapshot.rng_state
+        self._explorer = None
+
+    def clear_tile(self, x: int, y: int) -> None:
+        """
+        Move the entity blocking a tile, if any, to the closest free walkable
+            tile, e.g. to make room for the player arriving on this map. If
+            there is no free tile left, the entity is removed from the map.
+        Parameters:
+            x (int): The x coordinate of the tile to clear.
+            y (int): The y coordinate of the tile to clear.
+        """
+        entity = self.get_blocking_entity_at_location(x, y)
+        if entity is None:
+            return
+
+        free = self.tiles["walkable"].copy()
+        for other in self.entities:
+            if other.blocks_movement:
+                free[other.x, other.y] = False
+        candidates = np.argwhere(free)
+        if not len(candidates):
+            self.entities.remove(entity)
+            return
+
+        distance = np.abs(candidates - (x, y)).max(axis=1)
+        entity.x, entity.y = candidates[distance.argmin()].tolist()
+        self.mark_moved()
+
     def get_blocking_entity_at_location(
         self,
         location_x: int,
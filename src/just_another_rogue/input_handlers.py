@@ -1,9 +1,16 @@
 from __future__ import annotations
 
+import tcod.context
 import tcod.event
 import typing as t
 
-from just_another_rogue.actions import Action, BumpAction, EscapeAction
+from just_another_rogue.actions import (
+    Action,
+    AutoExploreAction,
+    BumpAction,
+    EscapeAction,
+    TravelAction,
+)
 
 
 if t.TYPE_CHECKING:
@@ -21,21 +28,30 @@ class EventHandler(tcod.event.EventDispatch[Action]):
     def __init__(self, engine: Engine) -> None:
         self.engine = engine
 
-    def handle_events(self) -> None:
+    def handle_events(self, context: tcod.context.Context) -> None:
         """
         Method to handle the events. Iterate through the events and perform the
             action if any. After that calls for the engine to handle ememies'
-            turns and handle the fov.
+            turns and handle the fov. Actions that take several turns (e.g.
+            travelling) are performed again until they are done, without
+            rendering the turns in between.
+        Parameters:
+            context (Context): Used to convert mouse events to tile
+                coordinates.
         """
         for event in tcod.event.wait():
+            context.convert_event(event)
             action = self.dispatch(event)
 
             if action is None:
                 continue
 
-            action.perform()
-            self.engine.handle_enemy_turns()
-            self.engine.update_fov()
+            while True:
+                action.perform()
+                self.engine.handle_enemy_turns()
+                self.engine.update_fov()
+                if not action.repeat():
+                    break
 
     def ev_quit(self, event: tcod.event.Quit) -> t.Optional[Action]:
         """
@@ -46,6 +62,18 @@ class EventHandler(tcod.event.EventDispatch[Action]):
         """
         raise SystemExit()
 
+    def ev_mousebuttondown(
+        self, event: tcod.event.MouseButtonDown
+    ) -> t.Optional[Action]:
+        """
+        This method will receive mouse clicks. A left click on a tile makes the
+            player travel to it.
+        """
+        if event.button != tcod.event.BUTTON_LEFT:
+            return None
+        x, y = event.tile
+        return TravelAction(self.engine.player, int(x), int(y))
+
     def ev_keydown(self, event: tcod.event.KeyDown) -> t.Optional[Action]:
         """
         This method will receive key press events, and return either an Action
@@ -58,6 +86,7 @@ class EventHandler(tcod.event.EventDispatch[Action]):
             tcod.event.K_DOWN: BumpAction(player, dx=0, dy=1),
             tcod.event.K_LEFT: BumpAction(player, dx=-1, dy=0),
             tcod.event.K_RIGHT: BumpAction(player, dx=1, dy=0),
+            tcod.event.K_o: AutoExploreAction(player),
             tcod.event.K_ESCAPE: EscapeAction(player)
         }
         return actions.get(key, EscapeAction(player))
@@ -1,6 +1,7 @@
 import copy
 import tcod
 
+from just_another_rogue import color
 from just_another_rogue import entity_factories
 from just_another_rogue.engine import Engine
 from just_another_rogue.procgen import generate_dungeon
@@ -10,7 +11,7 @@ def main() -> bool:
     screen_width = 80
     screen_height = 50
     map_width = 80
-    map_height = 50
+    map_height = 43
     room_max_size = 10
     room_min_size = 6
     max_rooms = 30
@@ -35,8 +36,14 @@ def main() -> bool:
         engine=engine
     )
 
+    # The walls never change, so the fields of view can be precomputed.
+    engine.game_map.build_visibility_atlas(engine.fov_radius, background=True)
     engine.update_fov()
 
+    engine.message_log.add_message(
+        "Hello and welcome, adventurer, to yet another dungeon!",
+        color.welcome_text)
+
     with tcod.context.new_terminal(
         screen_width,
         screen_height,
@@ -52,7 +59,7 @@ def main() -> bool:
 
         while True:
             engine.render(console=root_console, context=context)
-            engine.event_handler.handle_events()
+            engine.event_handler.handle_events(context)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import collections
+import textwrap
+import threading
+import typing as t
+from tcod.console import Console
+
+from just_another_rogue import color
+
+
+class Message:
+    """
+    A single line of text in the message log. Repeated messages are merged
+        into one Message, whose count tell us how many times it was added.
+    Properties:
+        plain_text (str): The text of the message, without the count.
+        fg (Tuple[int, int, int]): The color used to draw the message.
+        count (int): How many times this message was added in a row.
+    """
+    def __init__(self, text: str, fg: t.Tuple[int, int, int]) -> None:
+        self.plain_text = text
+        self.fg = fg
+        self.count = 1
+
+    @property
+    def full_text(self) -> str:
+        """
+        Returns:
+            str: The full text of this message, including the count if it is
+                greater than 1 (e.g. "The Orc wonders... (x12)").
+        """
+        if self.count > 1:
+            return f"{self.plain_text} (x{self.count})"
+        return self.plain_text
+
+
+class MessageLog:
+    """
+    MessageLog keeps the most recent messages in a fixed-capacity ring buffer.
+        Adding a message is cheap enough to be done inside the turn loop: it
+        either bumps the count of the last message or appends a new one,
+        dropping the oldest message once the capacity is reached. The log is
+        drawn once per frame by Engine.render.
+    Properties:
+        messages (Deque[Message]): The stored messages, oldest first.
+        capacity (int): The maximum number of messages kept by the log.
+    """
+    def __init__(self, capacity: int = 1024) -> None:
+        self.capacity = capacity
+        self.messages: t.Deque[Message] = collections.deque(maxlen=capacity)
+        self._flushes: t.Deque[t.Tuple[str, t.List[str]]] = collections.deque()
+        self._flush_lock = threading.Lock()
+        self._writer: t.Optional[threading.Thread] = None
+
+    def __getstate__(self) -> t.Dict[str, t.Any]:
+        """
+        Leave the flushes out when copying or pickling this log: a lock and
+            a thread cannot be copied, and the copy writes its own flushes.
+        """
+        state = self.__dict__.copy()
+        del state["_flushes"], state["_flush_lock"], state["_writer"]
+        return state
+
+    def __setstate__(self, state: t.Dict[str, t.Any]) -> None:
+        self.__dict__.update(state)
+        self._flushes = collections.deque()
+        self._flush_lock = threading.Lock()
+        self._writer = None
+
+    def add_message(
+        self,
+        text: str,
+        fg: t.Tuple[int, int, int] = color.white,
+        *,
+        stack: bool = True,
+    ) -> None:
+        """
+        Add a message to this log.
+        Parameters:
+            text (str): The message text.
+            fg (Tuple[int, int, int]): The text color.
+            stack (bool): If True, and the previous message has the same text
+                and color, the previous message's count is increased instead
+                of adding a new message.
+        """
+        if (
+            stack
+            and self.messages
+            and text == self.messages[-1].plain_text
+            and fg == self.messages[-1].fg
+        ):
+            self.messages[-1].count += 1
+        else:
+            self.messages.append(Message(text, fg))
+
+    def render(
+        self,
+        console: Console,
+        x: int,
+        y: int,
+        width: int,
+        height: int,
+    ) -> None:
+        """
+        Render this log over the given area. The most recent messages are
+            drawn at the bottom, and older messages above them, until the area
+            is full.
+        Parameters:
+            console (Console): The console to draw the messages on.
+            x (int): The x coordinate of the top left corner of the area.
+            y (int): The y coordinate of the top left corner of the area.
+            width (int): The width of the area.
+            height (int): The height of the area.
+        """
+        if height <= 0:
+            return
+
+        y_offset = height - 1
+
+        for message in reversed(self.messages):
+            for line in reversed(textwrap.wrap(message.full_text, width)):
+                console.print(x=x, y=y + y_offset, string=line, fg=message.fg)
+                y_offset -= 1
+                if y_offset < 0:
+                    return
+
+    def flush_to_file(self, path: str) -> threading.Thread:
+        """
+        Write the messages currently in this log to a file, for diagnostics.
+            The messages are copied right away, but the file is written by a
+            background thread so the game loop is not blocked on disk I/O.
+            A single writer thread handles the flushes, one after the other,
+            in the order they were asked for. It is not a daemon thread, so
+            the interpreter waits for the pending flushes before exiting.
+        Parameters:
+            path (str): The path of the file to append the messages to.
+        Returns:
+            Thread: The writer thread. Join it to wait for this flush, and any
+                flush asked for since, to finish.
+        """
+        lines = [message.full_text for message in self.messages]
+
+        with self._flush_lock:
+            self._flushes.append((path, lines))
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_flushes)
+                self._writer.start()
+            return self._writer
+
+    def _write_flushes(self) -> None:
+        """
+        Write the pending flushes, then stop once there are none left. If a
+            write fails, the error is raised in this thread, and the next
+            flush starts a new writer for the flushes still pending.
+        """
+        while True:
+            with self._flush_lock:
+                if not self._flushes:
+                    self._writer = None
+                    return
+                path, lines = self._flushes.popleft()
+
+            try:
+                with open(path, "a", encoding="utf-8") as f:
+                    f.writelines(f"{line}\n" for line in lines)
+            except BaseException:
+                with self._flush_lock:
+                    self._writer = None
+                raise
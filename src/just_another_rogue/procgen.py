@@ -181,4 +181,5 @@ def generate_dungeon(
         place_entities(new_room, dungeon, max_monster_per_room)
         rooms.append(new_room)
 
+    dungeon.max_monsters = len(dungeon.entities) - 1
     return dungeon
@@ -0,0 +1,123 @@
+from __future__ import annotations
+
+import numpy as np
+import threading
+import typing as t
+from tcod.map import compute_fov
+
+
+def fov_window(
+    x: int, y: int, radius: int, width: int, height: int
+) -> t.Tuple[slice, slice]:
+    """
+    Returns:
+        Tuple[slice, slice]: The square of side 2 * radius + 1 centered on
+            (x, y), clipped to a width x height map. A field of view of the
+            given radius never reaches outside of it.
+    """
+    return (
+        slice(max(x - radius, 0), min(x + radius + 1, width)),
+        slice(max(y - radius, 0), min(y + radius + 1, height)),
+    )
+
+
+class VisibilityAtlas:
+    """
+    VisibilityAtlas stores the field of view from every walkable tile of a
+        map whose walls never change, so it can be looked up instead of
+        computed each turn. Each field of view is stored as the square window
+        of side 2 * radius + 1 around its origin, bit-packed.
+    Properties:
+        radius (int): The radius of the stored fields of view.
+        index (np.ndarray): For each tile, the row of its field of view in
+            masks, or -1 if it was not precomputed.
+        masks (np.ndarray): The bit-packed fields of view, one per row.
+    """
+    def __init__(
+        self,
+        transparent: np.ndarray,
+        walkable: np.ndarray,
+        radius: int,
+    ) -> None:
+        self.radius = radius
+        self._transparent = transparent
+        self._side = 2 * radius + 1
+
+        self.index = np.full(transparent.shape, -1, dtype=np.int32, order="F")
+        self._origins = np.argwhere(walkable)
+        self.index[self._origins[:, 0], self._origins[:, 1]] = np.arange(
+            len(self._origins), dtype=np.int32)
+        self.masks = np.zeros(
+            (len(self._origins), (self._side * self._side + 7) // 8),
+            dtype=np.uint8)
+
+        self._ready = threading.Event()
+
+    @property
+    def ready(self) -> bool:
+        """
+        Returns:
+            bool: True once every field of view has been computed.
+        """
+        return self._ready.is_set()
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Returns:
+            int: The memory used by the index and the packed fields of view.
+        """
+        return self.index.nbytes + self.masks.nbytes
+
+    def build(self) -> None:
+        """
+        Compute every field of view. Tiles outside the map are seen as walls.
+        """
+        r = self.radius
+        padded = np.pad(self._transparent, r, constant_values=False)
+
+        for row, (x, y) in enumerate(self._origins.tolist()):
+            fov = compute_fov(
+                padded[x:x + self._side, y:y + self._side], (r, r), radius=r)
+            self.masks[row] = np.packbits(fov, axis=None)
+
+        self._ready.set()
+
+    def build_in_background(self) -> threading.Thread:
+        """
+        Compute every field of view in a background thread. The atlas is not
+            used before it is ready.
+        Returns:
+            Thread: The thread building the atlas.
+        """
+        thread = threading.Thread(target=self.build, daemon=True)
+        thread.start()
+        return thread
+
+    def covers(self, x: int, y: int) -> bool:
+        """
+        Returns:
+            bool: True if the field of view from (x, y) can be looked up.
+        """
+        return self.ready and self.index[x, y] >= 0
+
+    def fill(self, visible: np.ndarray, x: int, y: int) -> None:
+        """
+        Write the field of view from (x, y) into visible. Only the window
+            around (x, y) is written, so the caller must clear the previous
+            field of view first.
+        Parameters:
+            visible (np.ndarray): The visible tiles to write to.
+            x (int): The x coordinate of the origin of the field of view.
+            y (int): The y coordinate of the origin of the field of view.
+        """
+        r = self.radius
+        mask = np.unpackbits(
+            self.masks[self.index[x, y]], count=self._side * self._side
+        ).reshape(self._side, self._side).view(bool)
+
+        wx, wy = fov_window(x, y, r, *visible.shape)
+        visible[wx, wy] = mask[
+            wx.start - (x - r):wx.stop - (x - r),
+            wy.start - (y - r):wy.stop - (y - r),
+        ]
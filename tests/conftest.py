@@ -0,0 +1,97 @@
+"""
+Fixtures building the engines and levels the tests play on. Each fixture
+returns a function, so a test can build as many of them as it needs.
+"""
+import copy
+import random
+import typing as t
+
+import pytest
+
+from just_another_rogue import entity_factories
+from just_another_rogue import tile_types
+from just_another_rogue.engine import Engine
+from just_another_rogue.game_map import GameMap
+from just_another_rogue.procgen import generate_dungeon
+
+
+@pytest.fixture
+def new_engine() -> t.Callable[..., Engine]:
+    def make(ai_workers: int = 0, seed: int = 0) -> Engine:
+        """
+        Create an engine with a fresh player, and no level yet.
+        """
+        return Engine(
+            copy.deepcopy(entity_factories.player), ai_workers, seed)
+    return make
+
+
+@pytest.fixture
+def dungeon(new_engine: t.Callable[..., Engine]) -> t.Callable[..., Engine]:
+    def make(
+        seed: int = 0,
+        max_monster_per_room: int = 2,
+        ai_workers: int = 0,
+        see_all: bool = False,
+    ) -> Engine:
+        """
+        Generate an 80x43 level with the settings main() uses.
+        Parameters:
+            seed (int): Seed for the dungeon generation and the engine.
+            max_monster_per_room (int): Monsters placed in each room, at most.
+            ai_workers (int): See Engine.
+            see_all (bool): If True, the whole level is marked as visible,
+                so every monster takes a real turn.
+        """
+        random.seed(seed)
+        engine = new_engine(ai_workers, seed)
+        engine.game_map = generate_dungeon(
+            max_rooms=30,
+            room_min_size=6,
+            room_max_size=10,
+            map_width=80,
+            map_heigth=43,
+            max_monster_per_room=max_monster_per_room,
+            engine=engine)
+        engine.update_fov()
+        if see_all:
+            engine.game_map.visible[:] = True
+        return engine
+    return make
+
+
+@pytest.fixture
+def arena() -> t.Callable[..., GameMap]:
+    def make(engine: Engine, size: int = 10) -> GameMap:
+        """
+        Build a level made of a single open room, surrounded by walls.
+        """
+        game_map = GameMap(engine, size, size)
+        game_map.tiles[1:-1, 1:-1] = tile_types.floor
+        return game_map
+    return make
+
+
+@pytest.fixture
+def arena_engine(
+    new_engine: t.Callable[..., Engine],
+    arena: t.Callable[..., GameMap],
+) -> t.Callable[..., Engine]:
+    def make(
+        size: int = 10,
+        player_xy: t.Tuple[int, int] = (2, 2),
+        see_all: bool = False,
+    ) -> Engine:
+        """
+        Create an engine whose player stands in an arena (see arena).
+        Parameters:
+            size (int): The width and height of the arena.
+            player_xy (Tuple[int, int]): Where the player stands.
+            see_all (bool): If True, the whole arena is marked as visible.
+        """
+        engine = new_engine()
+        engine.enter_level(arena(engine, size), *player_xy)
+        if see_all:
+            engine.game_map.visible[:] = True
+        return engine
+    return make
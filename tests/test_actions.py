@@ -0,0 +1,93 @@
+import typing as t
+
+from just_another_rogue import entity_factories
+from just_another_rogue.actions import (
+    Action,
+    AutoExploreAction,
+    TravelAction,
+)
+from just_another_rogue.engine import Engine
+
+Factory = t.Callable[..., Engine]
+
+
+def run(engine: Engine, action: Action) -> int:
+    """
+    Perform an action the way EventHandler.handle_events does.
+    Returns:
+        int: The number of turns it took.
+    """
+    turns = 0
+    while True:
+        action.perform()
+        engine.handle_enemy_turns()
+        engine.update_fov()
+        turns += 1
+        if not action.repeat():
+            return turns
+
+
+def last_message(engine: Engine) -> str:
+    return engine.message_log.messages[-1].plain_text
+
+
+def test_travel_reaches_explored_destination(arena_engine: Factory) -> None:
+    engine = arena_engine(size=20)
+    run(engine, TravelAction(engine.player, 8, 8))
+    assert (engine.player.x, engine.player.y) == (8, 8)
+
+
+def test_travel_to_unknown_tile_says_so(arena_engine: Factory) -> None:
+    engine = arena_engine(size=20)
+    run(engine, TravelAction(engine.player, 17, 17))
+    assert (engine.player.x, engine.player.y) == (2, 2)
+    assert last_message(engine) == "You don't know how to get there."
+
+
+def test_travel_does_not_start_next_to_a_monster(
+    arena_engine: Factory,
+) -> None:
+    engine = arena_engine(size=20)
+    entity_factories.orc.spaws(engine.game_map, 3, 3)
+    engine.update_fov()
+    run(engine, TravelAction(engine.player, 8, 2))
+    assert (engine.player.x, engine.player.y) == (2, 2)
+
+
+def test_travel_stops_when_a_visible_monster_gets_close(
+    arena_engine: Factory,
+) -> None:
+    engine = arena_engine(size=20)
+    orc = entity_factories.orc.spaws(engine.game_map, 9, 2)
+    engine.update_fov()
+    run(engine, TravelAction(engine.player, 9, 8))
+    distance = max(
+        abs(orc.x - engine.player.x), abs(orc.y - engine.player.y))
+    assert distance <= TravelAction.danger_distance
+    assert (engine.player.x, engine.player.y) != (9, 8)
+
+
+def test_travel_stops_when_attacked(arena_engine: Factory) -> None:
+    engine = arena_engine(size=20)
+    action = TravelAction(engine.player, 8, 8)
+    action.danger_distance = 0
+    entity_factories.orc.spaws(engine.game_map, 6, 6)
+    engine.update_fov()
+    action.seen = action.visible_entities()
+
+    run(engine, action)
+
+    assert engine.player_attacked
+    assert "kicks you" in last_message(engine)
+
+
+def test_auto_explore_uncovers_the_whole_level(dungeon: Factory) -> None:
+    engine = dungeon(seed=3, max_monster_per_room=0)
+
+    run(engine, AutoExploreAction(engine.player))
+
+    game_map = engine.game_map
+    walkable = game_map.tiles["walkable"]
+    assert (game_map.explored[walkable]).all()
+    run(engine, AutoExploreAction(engine.player))
+    assert last_message(engine) == "There is nothing left to explore."
@@ -0,0 +1,117 @@
+import typing as t
+
+import pytest
+
+from just_another_rogue import entity_factories
+from just_another_rogue.engine import Engine
+
+Factory = t.Callable[..., Engine]
+
+
+def play(engine: Engine, turns: int) -> t.Tuple[t.Any, t.Any]:
+    for _ in range(turns):
+        engine.handle_enemy_turns()
+    positions = sorted(
+        (e.x, e.y, e.name) for e in engine.game_map.entities)
+    messages = [m.full_text for m in engine.message_log.messages]
+    return positions, messages
+
+
+@pytest.mark.parametrize("seed", [0, 1, 2])
+def test_parallel_turns_match_serial_turns(
+    dungeon: Factory, seed: int
+) -> None:
+    def dungeon_engine(ai_workers: int = 0) -> Engine:
+        return dungeon(seed, 4, ai_workers, see_all=True)
+
+    start = play(dungeon_engine(), turns=0)
+    serial = play(dungeon_engine(), turns=20)
+    with dungeon_engine(ai_workers=2) as engine:
+        parallel = play(engine, turns=20)
+    assert parallel == serial
+    assert serial[0] != start[0], "the monsters should have moved"
+
+
+def test_first_monster_in_position_order_wins_a_contested_tile(
+    arena_engine: Factory,
+) -> None:
+    engine = arena_engine(player_xy=(5, 5), see_all=True)
+    first = entity_factories.orc.spaws(engine.game_map, 3, 4)
+    second = entity_factories.troll.spaws(engine.game_map, 3, 6)
+
+    # Both step diagonally towards the player, into (4, 5).
+    engine.handle_enemy_turns()
+
+    assert (first.x, first.y) == (4, 5)
+    assert (second.x, second.y) == (3, 6)
+
+
+def test_adjacent_monster_attacks_instead_of_moving(
+    arena_engine: Factory,
+) -> None:
+    engine = arena_engine(player_xy=(5, 5), see_all=True)
+    orc = entity_factories.orc.spaws(engine.game_map, 4, 4)
+
+    engine.handle_enemy_turns()
+
+    assert (orc.x, orc.y) == (4, 4)
+    assert "kicks you" in engine.message_log.messages[-1].plain_text
+
+
+def test_monsters_moved_between_turns_are_tracked(
+    arena_engine: Factory,
+) -> None:
+    engine = arena_engine(player_xy=(5, 5), see_all=True)
+    orc = entity_factories.orc.spaws(engine.game_map, 2, 2)
+    snapshot = engine.snapshot()
+    engine.handle_enemy_turns()
+    assert (orc.x, orc.y) == (3, 3)
+
+    engine.restore(snapshot)
+    engine.handle_enemy_turns()
+    assert (orc.x, orc.y) == (3, 3)
+
+    # The tile the orc left must be free again for the troll.
+    troll = entity_factories.troll.spaws(engine.game_map, 1, 1)
+    orc.place(8, 8)
+    engine.handle_enemy_turns()
+    assert (orc.x, orc.y) == (7, 7)
+    assert (troll.x, troll.y) == (2, 2)
+    engine.handle_enemy_turns()
+    assert (troll.x, troll.y) == (3, 3)
+
+
+def test_workers_follow_blocks_that_grow(arena_engine: Factory) -> None:
+    def populate(engine: Engine, xs: t.Iterable[int]) -> None:
+        for x in xs:
+            entity_factories.orc.spaws(engine.game_map, x, 8)
+
+    serial = arena_engine(player_xy=(5, 5), see_all=True)
+    populate(serial, [1])
+    serial.handle_enemy_turns()
+    populate(serial, range(2, 9))
+    serial.handle_enemy_turns()
+
+    with arena_engine(player_xy=(5, 5), see_all=True) as engine:
+        engine.ai.workers = 2
+        populate(engine, [1])
+        engine.handle_enemy_turns()
+        old_block = engine.ai.snapshot.blocks["positions"].name
+
+        # More actors than the positions block holds: it is reallocated.
+        populate(engine, range(2, 9))
+        engine.handle_enemy_turns()
+
+        assert engine.ai.snapshot.blocks["positions"].name != old_block
+        assert play(engine, 0) == play(serial, 0)
+
+
+def test_close_releases_shared_memory(dungeon: Factory) -> None:
+    engine = dungeon(ai_workers=2, see_all=True)
+    engine.handle_enemy_turns()
+    blocks = list(engine.ai.snapshot.blocks.values())
+    engine.close()
+    assert not engine.ai.snapshot.blocks
+    for block in blocks:
+        with pytest.raises(FileNotFoundError):
+            type(block)(name=block.name)
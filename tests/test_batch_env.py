@@ -0,0 +1,47 @@
+import numpy as np
+
+from just_another_rogue.batch_env import BatchEnv
+
+
+def assert_attached(env: BatchEnv) -> None:
+    for i, engine in enumerate(env.engines):
+        game_map = engine.game_map
+        assert np.shares_memory(game_map.tiles, env.tiles[i])
+        assert np.shares_memory(game_map.visible, env.visible[i])
+        assert np.shares_memory(game_map.explored, env.explored[i])
+
+
+def test_observations_stay_attached_after_snapshot_and_restore() -> None:
+    env = BatchEnv(num_envs=2)
+    observations = env.reset(seed=0)
+    snapshots = [engine.snapshot() for engine in env.engines]
+    expected = observations["visible"].copy(), observations["explored"].copy()
+
+    for action in (1, 2, 3, 4, 5, 6, 7, 8):
+        env.step([action, action])
+    assert_attached(env)
+
+    for engine, snapshot in zip(env.engines, snapshots):
+        engine.restore(snapshot)
+    assert_attached(env)
+    np.testing.assert_array_equal(observations["visible"], expected[0])
+    np.testing.assert_array_equal(observations["explored"], expected[1])
+
+    env.step([4, 4])
+    assert_attached(env)
+    for i, engine in enumerate(env.engines):
+        np.testing.assert_array_equal(
+            observations["visible"][i], engine.game_map.visible)
+
+
+def test_forks_do_not_write_into_the_observations() -> None:
+    env = BatchEnv(num_envs=1)
+    observations = env.reset(seed=0)
+    explored = observations["explored"].copy()
+
+    fork = env.engines[0].fork()
+    fork.game_map.writable("explored")[:] = True
+    fork.game_map.writable("tiles")[:] = fork.game_map.tiles[0, 0]
+
+    assert_attached(env)
+    np.testing.assert_array_equal(observations["explored"], explored)
@@ -0,0 +1,102 @@
+import typing as t
+
+import numpy as np
+import pytest
+
+from just_another_rogue import entity_factories
+from just_another_rogue.catch_up import catch_up
+from just_another_rogue.engine import Engine
+from just_another_rogue.game_map import GameMap
+
+Factory = t.Callable[..., Engine]
+
+
+def positions(game_map: GameMap) -> t.List[t.Tuple[int, int, str]]:
+    return sorted((e.x, e.y, e.name) for e in game_map.entities)
+
+
+def assert_on_distinct_free_floor(engine: Engine) -> None:
+    game_map = engine.game_map
+    tiles = [(e.x, e.y) for e in game_map.entities]
+    assert len(set(tiles)) == len(tiles)
+    for x, y in tiles:
+        assert game_map.tiles["walkable"][x, y]
+
+
+@pytest.mark.parametrize("elapsed_turns", [1, 30, 10_000])
+def test_monsters_wander_to_distinct_walkable_tiles(
+    dungeon: Factory, elapsed_turns: int
+) -> None:
+    engine = dungeon(max_monster_per_room=4)
+    game_map = engine.game_map
+    player_xy = (engine.player.x, engine.player.y)
+    before = positions(game_map)
+
+    catch_up(game_map, elapsed_turns, np.random.default_rng(0))
+
+    assert_on_distinct_free_floor(engine)
+    assert (engine.player.x, engine.player.y) == player_xy
+    assert positions(game_map) != before
+
+
+def test_crowded_monsters_never_share_a_tile(arena_engine: Factory) -> None:
+    engine = arena_engine(size=10, player_xy=(5, 5))
+    for x in range(1, 9):
+        for y in range(1, 6):
+            if (x, y) != (5, 5):
+                entity_factories.orc.spaws(engine.game_map, x, y)
+
+    for seed in range(10):
+        catch_up(engine.game_map, 3, np.random.default_rng(seed))
+        assert_on_distinct_free_floor(engine)
+
+
+@pytest.mark.parametrize("elapsed_turns", [0, -5])
+def test_no_elapsed_turns_changes_nothing(
+    dungeon: Factory, elapsed_turns: int
+) -> None:
+    engine = dungeon()
+    game_map = engine.game_map
+    game_map.max_monsters += 10
+    before = positions(game_map)
+
+    catch_up(game_map, elapsed_turns, respawn_interval=1)
+
+    assert positions(game_map) == before
+
+
+def test_respawns_follow_the_interval_up_to_max_monsters(
+    arena_engine: Factory,
+) -> None:
+    engine = arena_engine(size=20)
+    game_map = engine.game_map
+    game_map.max_monsters = 5
+    entity_factories.orc.spaws(game_map, 10, 10)
+    rng = np.random.default_rng(0)
+
+    def monsters() -> int:
+        return len(game_map.entities) - 1
+
+    catch_up(game_map, 99, rng, respawn_interval=100)
+    assert monsters() == 1
+    catch_up(game_map, 250, rng, respawn_interval=100)
+    assert monsters() == 3
+    catch_up(game_map, 10_000, rng, respawn_interval=100)
+    assert monsters() == 5
+    assert_on_distinct_free_floor(engine)
+
+
+def test_coming_back_to_a_level_is_reproducible(
+    dungeon: Factory, arena: t.Callable[..., GameMap]
+) -> None:
+    def come_back(seed: int) -> t.List[t.Tuple[int, int, str]]:
+        engine = dungeon(seed)
+        level, start = engine.game_map, (engine.player.x, engine.player.y)
+        level.max_monsters += 3
+        engine.enter_level(arena(engine), 2, 2)
+        engine.turn += 1000
+        engine.enter_level(level, *start)
+        return positions(level)
+
+    assert come_back(seed=0) == come_back(seed=0)
+    assert come_back(seed=0) != come_back(seed=1)
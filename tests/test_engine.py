@@ -0,0 +1,130 @@
+import typing as t
+
+import pytest
+
+from just_another_rogue import entity_factories
+from just_another_rogue.engine import Engine
+from just_another_rogue.game_map import GameMap
+
+Factory = t.Callable[..., Engine]
+Arena = t.Callable[..., GameMap]
+
+
+def blockers_at(game_map: GameMap, x: int, y: int) -> t.List[str]:
+    return [
+        e.name for e in game_map.entities
+        if e.blocks_movement and (e.x, e.y) == (x, y)]
+
+
+def test_restore_rolls_back_the_turn(
+    new_engine: Factory, arena: Arena
+) -> None:
+    engine = new_engine()
+    engine.enter_level(arena(engine), 2, 2)
+    for _ in range(3):
+        engine.handle_enemy_turns()
+    snapshot = engine.snapshot()
+    for _ in range(5):
+        engine.handle_enemy_turns()
+
+    engine.restore(snapshot)
+
+    assert engine.turn == 3
+
+
+def test_level_catches_up_on_turns_counted_from_the_restored_turn(
+    new_engine: Factory, arena: Arena
+) -> None:
+    engine = new_engine()
+    first, second = arena(engine), arena(engine)
+    engine.enter_level(first, 2, 2)
+    engine.enter_level(second, 2, 2)
+    snapshot = engine.snapshot()
+    for _ in range(50):
+        engine.handle_enemy_turns()
+    engine.restore(snapshot)
+
+    engine.handle_enemy_turns()
+    assert first.last_turn is not None
+    assert engine.turn - first.last_turn == 1
+
+
+def test_monster_on_the_arrival_tile_makes_room(
+    new_engine: Factory, arena: Arena
+) -> None:
+    engine = new_engine()
+    start, level = arena(engine), arena(engine)
+    engine.enter_level(start, 2, 2)
+    orc = entity_factories.orc.spaws(level, 5, 5)
+
+    engine.enter_level(level, 5, 5)
+
+    assert blockers_at(level, 5, 5) == [engine.player.name]
+    assert orc in level.entities
+    assert max(abs(orc.x - 5), abs(orc.y - 5)) == 1
+    assert level.tiles["walkable"][orc.x, orc.y]
+
+
+def test_monster_with_nowhere_to_go_is_removed(
+    new_engine: Factory, arena: Arena
+) -> None:
+    engine = new_engine()
+    start, level = arena(engine), arena(engine, size=3)
+    engine.enter_level(start, 2, 2)
+    orc = entity_factories.orc.spaws(level, 1, 1)
+
+    engine.enter_level(level, 1, 1)
+
+    assert orc not in level.entities
+    assert blockers_at(level, 1, 1) == [engine.player.name]
+
+
+def test_restore_goes_back_to_the_level_of_the_snapshot(
+    new_engine: Factory, arena: Arena
+) -> None:
+    engine = new_engine()
+    first, second = arena(engine, size=10), arena(engine, size=20)
+    engine.enter_level(first, 2, 2)
+    orc = entity_factories.orc.spaws(first, 5, 5)
+    snapshot = engine.snapshot()
+    engine.enter_level(second, 3, 3)
+    for _ in range(5):
+        engine.handle_enemy_turns()
+
+    engine.restore(snapshot)
+    engine.update_fov()
+
+    assert engine.game_map is first
+    assert first.entities == {engine.player, orc}
+    assert engine.player not in second.entities
+    assert (engine.player.x, engine.player.y) == (2, 2)
+    assert engine.player.game_map is first and orc.game_map is first
+    assert first.last_turn is None
+    assert second.last_turn == snapshot.turn
+
+
+def test_restore_rejects_snapshots_of_other_engines(
+    new_engine: Factory, arena: Arena
+) -> None:
+    engine = new_engine()
+    engine.enter_level(arena(engine), 2, 2)
+    fork = engine.fork()
+
+    with pytest.raises(ValueError):
+        fork.restore(engine.snapshot())
+    with pytest.raises(ValueError):
+        fork.game_map.restore(engine.snapshot())
+
+
+def test_fork_and_restore_replay_the_same_random_numbers(
+    arena_engine: Factory,
+) -> None:
+    engine = arena_engine()
+    engine.rng.random()
+    snapshot = engine.snapshot()
+    fork = engine.fork()
+    expected = engine.rng.random(3)
+
+    assert (fork.rng.random(3) == expected).all()
+    engine.restore(snapshot)
+    assert (engine.rng.random(3) == expected).all()
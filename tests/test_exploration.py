@@ -0,0 +1,55 @@
+import typing as t
+
+import numpy as np
+import pytest
+
+from just_another_rogue import exploration
+from just_another_rogue.engine import Engine
+from just_another_rogue.exploration import Explorer
+
+Factory = t.Callable[..., Engine]
+
+
+def test_incremental_frontier_matches_a_full_recompute(
+    dungeon: Factory,
+) -> None:
+    engine = dungeon(seed=3, max_monster_per_room=0)
+    game_map = engine.game_map
+    explorer = game_map.explorer
+
+    while True:
+        step = explorer.next_step(engine.player.x, engine.player.y)
+        if step is None:
+            break
+        engine.player.x, engine.player.y = step
+        engine.update_fov()
+
+        explorer.update()
+        fresh = Explorer(game_map)
+        fresh.update()
+        np.testing.assert_array_equal(explorer.frontier, fresh.frontier)
+
+    assert game_map.explored[game_map.tiles["walkable"]].all()
+
+
+def test_paths_are_reused_between_steps(
+    dungeon: Factory, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    engine = dungeon(seed=3, max_monster_per_room=0)
+    calls = []
+
+    def find_path(*args: t.Any) -> t.List[t.Tuple[int, int]]:
+        calls.append(args)
+        return real_find_path(*args)
+
+    real_find_path = exploration.find_path
+    monkeypatch.setattr(exploration, "find_path", find_path)
+
+    steps = 0
+    explorer = engine.game_map.explorer
+    while (step := explorer.next_step(engine.player.x, engine.player.y)):
+        engine.player.x, engine.player.y = step
+        engine.update_fov()
+        steps += 1
+
+    assert steps > 2 * len(calls)
@@ -0,0 +1,86 @@
+import typing as t
+
+import numpy as np
+
+from just_another_rogue.engine import Engine
+
+Factory = t.Callable[..., Engine]
+
+
+def state(engine: Engine) -> t.Tuple[t.Any, ...]:
+    game_map = engine.game_map
+    return (
+        sorted((e.x, e.y, e.name) for e in game_map.entities),
+        game_map.visible.copy(),
+        game_map.explored.copy(),
+        game_map.fov_window,
+    )
+
+
+def assert_same_state(a: t.Tuple[t.Any, ...], b: t.Tuple[t.Any, ...]) -> None:
+    assert a[0] == b[0]
+    np.testing.assert_array_equal(a[1], b[1])
+    np.testing.assert_array_equal(a[2], b[2])
+    assert a[3] == b[3]
+
+
+def test_fork_leaves_the_parent_untouched(dungeon: Factory) -> None:
+    engine = dungeon()
+    game_map = engine.game_map
+    arrays = game_map.tiles, game_map.visible, game_map.explored
+    before = state(engine)
+
+    fork = engine.fork()
+    fork.player.move(1, 0)
+    fork.handle_enemy_turns()
+    fork.update_fov()
+    fork.game_map.writable("tiles")[:] = game_map.tiles[0, 0]
+
+    assert (game_map.tiles, game_map.visible, game_map.explored) == arrays
+    assert_same_state(state(engine), before)
+    assert all(array.flags.writeable for array in arrays)
+
+
+def test_parent_writes_through_writable_do_not_reach_the_fork(
+    dungeon: Factory,
+) -> None:
+    engine = dungeon()
+    fork = engine.fork()
+    expected = state(fork)
+
+    engine.game_map.writable("visible")[:] = True
+    engine.game_map.writable("explored")[:] = True
+
+    assert_same_state(state(fork), expected)
+    assert not fork.game_map.visible.flags.writeable
+
+
+def test_restoring_a_snapshot_twice_gives_the_same_state(
+    dungeon: Factory,
+) -> None:
+    engine = dungeon()
+    snapshot = engine.snapshot()
+    expected = state(engine)
+
+    for _ in range(2):
+        for dx in (1, 1, 0, -1):
+            engine.player.move(dx, 1)
+            engine.handle_enemy_turns()
+            engine.update_fov()
+        engine.restore(snapshot)
+        assert_same_state(state(engine), expected)
+
+
+def test_update_fov_on_a_fork_replaces_the_shared_visible_array(
+    dungeon: Factory,
+) -> None:
+    engine = dungeon()
+    fork = engine.fork()
+
+    fork.update_fov()
+
+    visible = fork.game_map.visible
+    assert visible.flags.writeable and visible.flags.owndata
+    assert visible.nbytes == engine.game_map.visible.nbytes
+    assert not np.shares_memory(visible, engine.game_map.visible)
+    np.testing.assert_array_equal(visible, engine.game_map.visible)
@@ -0,0 +1,95 @@
+import copy
+import pathlib
+
+import pytest
+from tcod.console import Console
+
+from just_another_rogue import color
+from just_another_rogue.message_log import MessageLog
+
+
+def test_repeated_messages_are_stacked() -> None:
+    log = MessageLog()
+    for _ in range(12):
+        log.add_message("The Orc wonders.")
+    assert len(log.messages) == 1
+    assert log.messages[0].full_text == "The Orc wonders. (x12)"
+
+
+def test_messages_with_different_colors_are_not_stacked() -> None:
+    log = MessageLog()
+    log.add_message("Hit!", color.player_atk)
+    log.add_message("Hit!", color.enemy_atk)
+    assert [m.fg for m in log.messages] == [color.player_atk, color.enemy_atk]
+
+
+def test_capacity_drops_oldest_messages() -> None:
+    log = MessageLog(capacity=3)
+    for i in range(5):
+        log.add_message(str(i))
+    assert [m.plain_text for m in log.messages] == ["2", "3", "4"]
+
+
+def test_render_with_no_room_draws_nothing() -> None:
+    console = Console(10, 5, order="F")
+    log = MessageLog()
+    log.add_message("hello")
+    log.render(console, x=0, y=6, width=10, height=-1)
+    log.render(console, x=0, y=4, width=10, height=0)
+    assert "hello" not in str(console)
+
+
+def test_render_draws_newest_message_at_the_bottom() -> None:
+    console = Console(10, 5, order="F")
+    log = MessageLog()
+    log.add_message("old")
+    log.add_message("new")
+    log.render(console, x=0, y=3, width=10, height=2)
+    rows = str(console).splitlines()
+    assert "old" in rows[3] and "new" in rows[4]
+
+
+def test_flushes_are_written_in_order(tmp_path: pathlib.Path) -> None:
+    path = str(tmp_path / "messages.log")
+    log = MessageLog()
+    threads = []
+    for i in range(50):
+        log.add_message(f"Message {i}")
+        threads.append(log.flush_to_file(path))
+    for thread in threads:
+        thread.join()
+
+    expected = [
+        f"Message {i}" for flush in range(50) for i in range(flush + 1)]
+    with open(path, encoding="utf-8") as f:
+        assert f.read().splitlines() == expected
+    assert not any(thread.daemon for thread in threads)
+
+
+@pytest.mark.filterwarnings(
+    "ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_a_failed_flush_does_not_stop_later_ones(
+    tmp_path: pathlib.Path,
+) -> None:
+    path = str(tmp_path / "messages.log")
+    log = MessageLog()
+    log.add_message("Saved.")
+
+    log.flush_to_file(str(tmp_path / "missing" / "messages.log")).join()
+    log.flush_to_file(path).join()
+
+    with open(path, encoding="utf-8") as f:
+        assert f.read() == "Saved.\n"
+
+
+def test_log_can_be_copied_while_flushing(tmp_path: pathlib.Path) -> None:
+    log = MessageLog()
+    log.add_message("Hit!")
+    thread = log.flush_to_file(str(tmp_path / "messages.log"))
+
+    clone = copy.deepcopy(log)
+    thread.join()
+
+    assert [m.full_text for m in clone.messages] == ["Hit!"]
+    clone.flush_to_file(str(tmp_path / "clone.log")).join()
+    assert (tmp_path / "clone.log").read_text(encoding="utf-8") == "Hit!\n"
@@ -0,0 +1,65 @@
+import typing as t
+
+import numpy as np
+
+from just_another_rogue.engine import Engine
+
+Factory = t.Callable[..., Engine]
+
+
+def dungeon_engine(dungeon: Factory, seed: int, atlas: bool) -> Engine:
+    engine = dungeon(seed, max_monster_per_room=0)
+    if atlas:
+        engine.game_map.build_visibility_atlas(engine.fov_radius)
+        engine.update_fov()
+    return engine
+
+
+def teleport(engines: t.Sequence[Engine], x: int, y: int) -> None:
+    for engine in engines:
+        engine.player.x, engine.player.y = x, y
+        engine.update_fov()
+
+
+def assert_same_fov(a: Engine, b: Engine) -> None:
+    np.testing.assert_array_equal(a.game_map.visible, b.game_map.visible)
+    np.testing.assert_array_equal(a.game_map.explored, b.game_map.explored)
+
+
+def floor_tiles(engine: Engine, count: int) -> t.List[t.Tuple[int, int]]:
+    floor = np.argwhere(engine.game_map.tiles["walkable"])
+    rng = np.random.default_rng(0)
+    return [tuple(xy) for xy in floor[rng.choice(len(floor), count)].tolist()]
+
+
+def test_atlas_matches_computed_field_of_view(dungeon: Factory) -> None:
+    computed = dungeon_engine(dungeon, seed=0, atlas=False)
+    looked_up = dungeon_engine(dungeon, seed=0, atlas=True)
+    assert_same_fov(computed, looked_up)
+
+    for x, y in floor_tiles(computed, 200):
+        assert looked_up.game_map.visibility_atlas.covers(x, y)
+        teleport([computed, looked_up], x, y)
+        assert_same_fov(computed, looked_up)
+
+
+def test_atlas_matches_after_restoring_another_fov_window(
+    dungeon: Factory,
+) -> None:
+    computed = dungeon_engine(dungeon, seed=1, atlas=False)
+    looked_up = dungeon_engine(dungeon, seed=1, atlas=True)
+    engines = [computed, looked_up]
+    (ax, ay), (bx, by), (cx, cy) = floor_tiles(computed, 3)
+
+    teleport(engines, ax, ay)
+    snapshots = [engine.snapshot() for engine in engines]
+    teleport(engines, bx, by)
+    assert looked_up.game_map.fov_window != snapshots[1].fov_window
+
+    # The restored window is the one around (ax, ay), not (bx, by), so the
+    # atlas must clear that one before drawing the new field of view.
+    for engine, snapshot in zip(engines, snapshots):
+        engine.restore(snapshot)
+    assert_same_fov(computed, looked_up)
+    teleport(engines, cx, cy)
+    assert_same_fov(computed, looked_up)